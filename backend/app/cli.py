@@ -0,0 +1,254 @@
+"""
+Maintenance commands, run from the repository root:
+
+    python -m backend.app.cli migrate
+    python -m backend.app.cli explain-check [--vacuum]
+    python -m backend.app.cli rebuild-stats
+    python -m backend.app.cli mail-worker
+    python -m backend.app.cli send-digests
+    python -m backend.app.cli provision-balances --year 2026 --quarter 3
+    python -m backend.app.cli compact-ledger
+    python -m backend.app.cli rebuild-balances
+    python -m backend.app.cli import-documents
+    python -m backend.app.cli gc-documents
+"""
+
+import argparse
+import sys
+from sqlalchemy import event
+
+from backend.database.postgres import SessionLocal, Base, engine
+
+
+def maintenance_session():
+    """
+    Session for long-running jobs: every transaction it opens lifts the
+    request statement_timeout with SET LOCAL, so pooled connections keep it
+    """
+
+    db = SessionLocal()
+
+    @event.listens_for(db, "after_begin")
+    def no_timeout(session, transaction, connection):
+        connection.exec_driver_sql("SET LOCAL statement_timeout = 0")
+
+    return db
+
+
+# ================= MIGRATE =================
+def migrate(args):
+    from backend.database.migrations import run_migrations
+
+    # Models are registered on Base by the backend.database package import
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    print("Database schema is up to date")
+
+
+# ================= EXPLAIN CHECK =================
+def explain_check(args):
+    from backend.database.explain_check import run_explain_check
+
+    failed = False
+
+    for name, ok, used in run_explain_check(engine, vacuum=args.vacuum):
+        scans = ", ".join(f"{node} on {index}" for node, index in sorted(used))
+        print(f"{'OK  ' if ok else 'FAIL'} {name}: {scans or 'no index'}")
+        failed = failed or not ok
+
+    if failed:
+        sys.exit(1)
+
+
+# ================= REBUILD STATS =================
+def rebuild_stats(args):
+    from backend.app.service.leave_stats_service import LeaveStatsService
+
+    db = maintenance_session()
+
+    try:
+        LeaveStatsService.rebuild_all(db)
+        db.commit()
+        print("Leave statistics rebuilt")
+    finally:
+        db.close()
+
+
+# ================= PROVISION BALANCES =================
+def provision_balances(args):
+    from backend.app.service.balance_provisioning_service import BalanceProvisioningService
+
+    db = maintenance_session()
+
+    try:
+        created = BalanceProvisioningService.provision(db, args.year, args.quarter)
+        db.commit()
+        print(f"Created {created} leave balances for {args.year} Q{args.quarter}")
+    finally:
+        db.close()
+
+
+# ================= BALANCE LEDGER =================
+def compact_ledger(args):
+    from backend.app.service.balance_ledger_service import BalanceLedgerService
+
+    db = maintenance_session()
+
+    try:
+        print(f"Updated {BalanceLedgerService.compact(db)} balance snapshots")
+    finally:
+        db.close()
+
+
+def rebuild_balances(args):
+    from backend.app.service.balance_ledger_service import BalanceLedgerService
+
+    db = maintenance_session()
+
+    try:
+        corrected = BalanceLedgerService.rebuild_projection(db)
+        print(f"Corrected {corrected} leave balances from the ledger")
+    finally:
+        db.close()
+
+
+# ================= IMPORT DOCUMENTS =================
+def import_documents(args):
+    from backend.app.service.document_service import DocumentService
+
+    db = maintenance_session()
+
+    try:
+        imported, missing = DocumentService.import_legacy_uploads(db)
+        print(f"Imported {imported} proof documents, {missing} files not found")
+    finally:
+        db.close()
+
+
+def gc_documents(args):
+    from backend.app.service.document_service import DocumentService
+
+    db = maintenance_session()
+
+    try:
+        rows, blobs = DocumentService.collect_garbage(db)
+        print(f"Removed {rows} unreferenced documents and {blobs} orphaned files")
+    finally:
+        db.close()
+
+
+# ================= MAIL WORKER =================
+def mail_worker(args):
+    from backend.app.service.mail_service import MailWorker
+
+    worker = MailWorker()
+
+    if args.once:
+        print(f"Processed {worker.run_once()} queued emails")
+        return
+
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.smtp_pool.close_all()
+
+
+# ================= SEND DIGESTS =================
+def send_digests(args):
+    from backend.app.service.digest_service import DigestScheduler
+
+    scheduler = DigestScheduler()
+
+    if args.once:
+        print(f"Queued {scheduler.run_once()} digests")
+        return
+
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="backend.app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "migrate",
+        help="Create missing tables and apply pending schema migrations"
+    ).set_defaults(func=migrate)
+
+    check = commands.add_parser(
+        "explain-check",
+        help="Verify the hot queries are planned on their indexes"
+    )
+    check.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="VACUUM ANALYZE the checked tables first so index-only scans are planned"
+    )
+    check.set_defaults(func=explain_check)
+
+    rebuild = commands.add_parser(
+        "rebuild-stats",
+        help="Backfill the leave status and monthly rollup tables"
+    )
+    rebuild.set_defaults(func=rebuild_stats)
+
+    provision = commands.add_parser(
+        "provision-balances",
+        help="Create every active user's leave balances for a quarter"
+    )
+    provision.add_argument("--year", type=int, required=True)
+    provision.add_argument("--quarter", type=int, choices=[1, 2, 3, 4], required=True)
+    provision.set_defaults(func=provision_balances)
+
+    commands.add_parser(
+        "compact-ledger",
+        help="Fold old balance ledger entries into per-balance snapshots"
+    ).set_defaults(func=compact_ledger)
+
+    commands.add_parser(
+        "rebuild-balances",
+        help="Recompute leave_balances from the balance ledger"
+    ).set_defaults(func=rebuild_balances)
+
+    commands.add_parser(
+        "import-documents",
+        help="Move legacy uploads/ proof files into the document store"
+    ).set_defaults(func=import_documents)
+
+    commands.add_parser(
+        "gc-documents",
+        help="Delete documents and stored files no leave request refers to"
+    ).set_defaults(func=gc_documents)
+
+    worker = commands.add_parser(
+        "mail-worker",
+        help="Deliver queued emails from the mail outbox"
+    )
+    worker.add_argument(
+        "--once",
+        action="store_true",
+        help="Send one batch and exit"
+    )
+    worker.set_defaults(func=mail_worker)
+
+    digests = commands.add_parser(
+        "send-digests",
+        help="Queue notification digests as their windows close"
+    )
+    digests.add_argument(
+        "--once",
+        action="store_true",
+        help="Run one round and exit"
+    )
+    digests.set_defaults(func=send_digests)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
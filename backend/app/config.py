@@ -5,6 +5,8 @@ load_dotenv()
 
 # ================= DATABASE =================
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Defaults to DATABASE_URL with the asyncpg driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
 
 # ================= JWT AUTH =================
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -18,3 +20,78 @@ MAIL_FROM = os.getenv("MAIL_FROM")
 MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
 MAIL_SERVER = os.getenv("MAIL_SERVER")
 MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME")
+
+# ================= CACHING =================
+# How often a worker re-checks the configuration version in the database
+CONFIG_CACHE_TTL_SECONDS = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", 30))
+
+# Authenticated user principals kept per worker
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+
+# How long a worker keeps its holiday calendar before reloading it
+HOLIDAY_CACHE_TTL_SECONDS = float(os.getenv("HOLIDAY_CACHE_TTL_SECONDS", 300))
+
+# ================= DATABASE POOL =================
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+# Per-statement limit in milliseconds, 0 disables it
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+# ================= PASSWORD HASHING =================
+# bcrypt work factor; existing hashes are upgraded on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+# Threads dedicated to bcrypt per worker
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+# Concurrent /auth/login attempts allowed per account and per client IP
+LOGIN_MAX_CONCURRENT_PER_ACCOUNT = int(os.getenv("LOGIN_MAX_CONCURRENT_PER_ACCOUNT", 2))
+LOGIN_MAX_CONCURRENT_PER_IP = int(os.getenv("LOGIN_MAX_CONCURRENT_PER_IP", 10))
+
+# ================= MAIL OUTBOX =================
+# Run the outbox worker inside each web process (set false when running
+# "python -m backend.app.cli mail-worker" separately)
+MAIL_WORKER_ENABLED = os.getenv("MAIL_WORKER_ENABLED", "true").lower() == "true"
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 50))
+MAIL_POLL_SECONDS = float(os.getenv("MAIL_POLL_SECONDS", 5))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 6))
+MAIL_RETRY_BASE_SECONDS = float(os.getenv("MAIL_RETRY_BASE_SECONDS", 30))
+# Warm SMTP connections are closed after this long without use
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", 60))
+
+# ================= NOTIFICATIONS =================
+# Templates live in backend/app/templates/email/<locale>/
+NOTIFICATION_DEFAULT_LOCALE = os.getenv("NOTIFICATION_DEFAULT_LOCALE", "en")
+# Run the digest scheduler inside each web process (only one builds a given
+# round; set false when running "python -m backend.app.cli send-digests")
+DIGEST_SCHEDULER_ENABLED = os.getenv("DIGEST_SCHEDULER_ENABLED", "true").lower() == "true"
+# Activity is collected per recipient for this long before one digest is sent
+DIGEST_WINDOW_MINUTES = float(os.getenv("DIGEST_WINDOW_MINUTES", 60))
+DIGEST_POLL_SECONDS = float(os.getenv("DIGEST_POLL_SECONDS", 60))
+# Recipients without a previous digest only get activity this recent
+DIGEST_MAX_LOOKBACK_HOURS = float(os.getenv("DIGEST_MAX_LOOKBACK_HOURS", 24))
+
+# ================= LEAVE BALANCES =================
+# Per-user /leave/balance responses, dropped when a balance changes
+BALANCE_CACHE_TTL_SECONDS = float(os.getenv("BALANCE_CACHE_TTL_SECONDS", 300))
+BALANCE_CACHE_MAX_SIZE = int(os.getenv("BALANCE_CACHE_MAX_SIZE", 10000))
+# Ledger entries older than this are folded into balance snapshots
+LEDGER_COMPACT_AFTER_HOURS = float(os.getenv("LEDGER_COMPACT_AFTER_HOURS", 24))
+
+# ================= FILE STORAGE =================
+# "local" keeps files under UPLOAD_DIR; "s3" works with any S3-compatible
+# store (e.g. a local MinIO: S3_ENDPOINT_URL=http://localhost:9000)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 1024 * 1024))
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION")
+S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY")
+S3_SECRET_KEY = os.getenv("S3_SECRET_KEY")
+# Generated preview images, safe to delete at any time
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "thumbnails")
+# Unreferenced documents and blobs younger than this are kept by gc-documents
+DOCUMENT_GC_GRACE_HOURS = float(os.getenv("DOCUMENT_GC_GRACE_HOURS", 24))
@@ -1,13 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from backend.database.postgres import SessionLocal, Base, engine
+from backend.database.migrations import run_migrations
 from backend.app.models.user import User
 from backend.app.utils.auth_utils import hash_password
+from backend.app.service.mail_service import MailWorker
+from backend.app.service.notification_service import NotificationService
+from backend.app.service.digest_service import DigestScheduler
+from backend.app.config import MAIL_WORKER_ENABLED, DIGEST_SCHEDULER_ENABLED
 
-from backend.app.routes import auth, leave, dashboard, manager, admin, user
+from backend.app.routes import auth, leave, dashboard, manager, admin, user, health
 from backend.app.routes.configuration import router as config_router
+from backend.app.routes.holidays import router as holidays_router
+from backend.app.routes.documents import router as documents_router
 
 app = FastAPI()
 
@@ -20,11 +26,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-
-# Create database tables
+# Create database tables, then apply schema migrations
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # Include routers
 app.include_router(auth.router)
@@ -33,6 +37,9 @@ app.include_router(dashboard.router)
 app.include_router(manager.router)
 app.include_router(admin.router)
 app.include_router(config_router)
+app.include_router(holidays_router)
+app.include_router(documents_router)
+app.include_router(health.router)
 app.include_router(user.router)
 
 
@@ -59,6 +66,29 @@ def create_default_admin():
     db.close()
 
 
+# Outbox delivery runs beside the app unless a dedicated worker is used
+mail_worker = MailWorker() if MAIL_WORKER_ENABLED else None
+digest_scheduler = DigestScheduler() if DIGEST_SCHEDULER_ENABLED else None
+
+
 @app.on_event("startup")
 def startup_event():
-    create_default_admin()
\ No newline at end of file
+    create_default_admin()
+
+    # Compile notification templates once per worker
+    NotificationService.load()
+
+    if mail_worker:
+        mail_worker.start()
+
+    if digest_scheduler:
+        digest_scheduler.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if digest_scheduler:
+        digest_scheduler.stop()
+
+    if mail_worker:
+        mail_worker.stop()
\ No newline at end of file
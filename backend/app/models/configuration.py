@@ -11,3 +11,11 @@ class Configuration(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
     updated_by = Column(String(100))
+
+
+class ConfigurationVersion(Base):
+    __tablename__ = "configuration_version"
+
+    # Single row bumped on every configuration change so all workers reload
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
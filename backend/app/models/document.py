@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from backend.database.postgres import Base
+
+
+class Document(Base):
+    __tablename__ = "documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # One row per distinct content
+    sha256 = Column(String(64), unique=True, nullable=False)
+    storage_key = Column(String, nullable=False)
+
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String, nullable=True)
+    # Name of the first upload with this content
+    filename = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, UniqueConstraint
 from backend.database.postgres import Base
 
 
 class LeaveBalance(Base):
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "leave_type", "year", "quarter",
+            name="uq_leave_balances_key"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -12,4 +18,13 @@ class LeaveBalance(Base):
     quarter = Column(Integer, nullable=False)
 
     leaves_taken = Column(Numeric(4, 1), default=0)
-    remaining_leaves = Column(Numeric(4, 1), default=0)
\ No newline at end of file
+    remaining_leaves = Column(Numeric(4, 1), default=0)
+
+class LeaveBalanceVersion(Base):
+    __tablename__ = "leave_balance_versions"
+
+    # Bumped in the same transaction as a user's balance change, so cached
+    # summaries on every worker can tell they are stale. user_id 0 is the
+    # epoch bumped by changes that touch everyone (e.g. provisioning).
+    user_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, ForeignKey, DateTime, Index
+from sqlalchemy.sql import func
+from backend.database.postgres import Base
+
+
+class LeaveBalanceEntry(Base):
+    __tablename__ = "leave_balance_ledger"
+    __table_args__ = (
+        # Snapshot + delta reads and per-balance audits
+        Index(
+            "ix_leave_balance_ledger_key",
+            "user_id", "leave_type", "year", "quarter", "id"
+        ),
+    )
+
+    # Append-only; rows are never updated or deleted
+    id = Column(BigInteger, primary_key=True)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    leave_type = Column(String, nullable=False)
+    year = Column(Integer, nullable=False)
+    quarter = Column(Integer, nullable=False)
+
+    # values: opening / grant / carry_forward / deduct / restore
+    kind = Column(String(20), nullable=False)
+
+    # Signed changes to the days granted and the days taken
+    granted_days = Column(Numeric(6, 1), nullable=False, default=0)
+    taken_days = Column(Numeric(6, 1), nullable=False, default=0)
+
+    leave_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=True)
+    performed_by = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class LeaveBalanceSnapshot(Base):
+    __tablename__ = "leave_balance_snapshots"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    leave_type = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    quarter = Column(Integer, primary_key=True)
+
+    # Totals of every ledger entry up to and including last_entry_id
+    granted_days = Column(Numeric(8, 1), nullable=False, default=0)
+    taken_days = Column(Numeric(8, 1), nullable=False, default=0)
+    last_entry_id = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -6,7 +6,7 @@ class LeaveLog(Base):
     __tablename__ = "leave_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    leave_id = Column(Integer, ForeignKey("leave_requests.id"))
+    leave_id = Column(Integer, ForeignKey("leave_requests.id"), index=True)
     action = Column(String)
     performed_by = Column(Integer, ForeignKey("users.id"))
-    timestamp = Column(TIMESTAMP, server_default=func.now())
+    timestamp = Column(TIMESTAMP, server_default=func.now(), index=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Numeric
+from backend.database.postgres import Base
+
+
+class LeaveMonthlyStat(Base):
+    __tablename__ = "leave_monthly_stats"
+
+    # Rollup of leave_requests by start month, maintained by LeaveStatsService
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    leave_type = Column(String, primary_key=True)
+    status = Column(String(20), primary_key=True)
+
+    total = Column(Integer, nullable=False, default=0)
+    days = Column(Numeric(10, 1), nullable=False, default=0)
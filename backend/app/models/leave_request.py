@@ -1,10 +1,31 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, DateTime, Index, CheckConstraint, text
 from sqlalchemy.sql import func
 from backend.database.postgres import Base
 
 
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        # Overlap check and per-user history; id included for index-only scans
+        Index(
+            "ix_leave_requests_user_status_dates",
+            "user_id", "status", "start_date", "end_date",
+            postgresql_include=["id"]
+        ),
+        # Pending queue only
+        Index(
+            "ix_leave_requests_pending",
+            "user_id", "start_date",
+            postgresql_include=["id"],
+            postgresql_where=text("status = 'Pending'")
+        ),
+        # Team history, newest first
+        Index("ix_leave_requests_user_id_id", "user_id", text("id DESC")),
+        CheckConstraint(
+            "status IN ('Pending', 'Approved', 'Rejected', 'Cancelled')",
+            name="ck_leave_requests_status"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -15,11 +36,12 @@ class LeaveRequest(Base):
 
     reason = Column(String)
 
-    status = Column(String, default="Pending")
+    status = Column(String, default="Pending", nullable=False)
 
     user_id = Column(Integer, ForeignKey("users.id"))
 
     proof_document = Column(String, nullable=True)
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=True)
 
     number_of_days = Column(Integer, nullable=False)
 
@@ -31,7 +53,7 @@ class LeaveRequest(Base):
     approved_on = Column(DateTime(timezone=True), nullable=True)
 
     # Time tracking
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+from backend.database.postgres import Base
+
+
+class LeaveStatusCount(Base):
+    __tablename__ = "leave_status_counts"
+
+    # Rollup of leave_requests per status, maintained by LeaveStatsService
+    status = Column(String(20), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
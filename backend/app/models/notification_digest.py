@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from backend.database.postgres import Base
+
+
+class NotificationDigest(Base):
+    __tablename__ = "notification_digests"
+
+    # One row per recipient; events after last_sent_at go into the next digest
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    last_sent_at = Column(DateTime(timezone=True), nullable=False)
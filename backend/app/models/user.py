@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, Index
 from backend.database.postgres import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # /manager/team; id included for index-only scans
+        Index("ix_users_manager_id", "manager_id", postgresql_include=["id"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -16,6 +20,9 @@ class User(Base):
 
     is_active = Column(Boolean, default=True, nullable=False)
 
+    # Send each notification right away instead of in the periodic digest
+    immediate_notifications = Column(Boolean, default=False, nullable=False, server_default="false")
+
     # Manager relationship
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
@@ -1,20 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func
-import csv
+from datetime import date
+from typing import Literal
 from fastapi.responses import StreamingResponse
-import io
 from backend.app.utils.auth_utils import hash_password
 from backend.app.schemas.auth_schema import RegisterSchema
 from backend.app.models.configuration import Configuration
-from backend.database.postgres import get_db
+from backend.database.postgres import get_db, get_async_db
 from backend.app.models.leave_request import LeaveRequest
 from backend.app.models.leave_logs import LeaveLog
 from backend.app.models.user import User
-from backend.app.utils.auth_utils import get_current_user
-from backend.app.utils.email_utils import send_email
+from backend.app.utils.auth_utils import get_current_user, invalidate_user, UserPrincipal
 from backend.app.service.approval_service import ApprovalService
-from backend.app.models.leave_balance import LeaveBalance
+from backend.app.service.notification_service import NotificationService
+from backend.app.service.leave_query_service import LeaveQueryService
+from backend.app.service.export_service import ExportService
+from backend.app.service.leave_stats_service import LeaveStatsService
+from backend.app.service.balance_provisioning_service import BalanceProvisioningService
+from backend.app.schemas.leave_schema import BulkDecisionSchema
 router = APIRouter(
     prefix="/admin",
     tags=["Admin"]
@@ -24,78 +29,71 @@ router = APIRouter(
 # ================= GET ALL LEAVES =================
 @router.get("/leaves")
 def get_all_leaves(
+    cursor: int | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    status: str | None = None,
+    user_id: int | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    format: Literal["json", "ndjson"] = "json",
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    leaves = db.query(LeaveRequest).all()
+    filters = {
+        "status": status,
+        "user_id": user_id,
+        "from_date": from_date,
+        "to_date": to_date
+    }
 
-    result = []
+    # Stream every matching row instead of paging
+    if format == "ndjson":
+        return StreamingResponse(
+            LeaveQueryService.stream_ndjson(cursor=cursor, **filters),
+            media_type="application/x-ndjson"
+        )
 
-    for leave in leaves:
-        result.append({
-    "id": leave.id,
-    "user_id": leave.user_id,
-    "leave_type": leave.leave_type,
-    "start_date": leave.start_date,
-    "end_date": leave.end_date,
-    "status": leave.status,
-    "reason": leave.reason,
-    "number_of_days": leave.number_of_days,
-    "remarks": leave.remarks,
-    "approved_by_role": leave.approved_by_role,
-    "approved_on": leave.approved_on,
-    "proof_document": leave.proof_document
-})
+    items, next_cursor = LeaveQueryService.list_page(
+        db,
+        limit=limit,
+        cursor=cursor,
+        **filters
+    )
 
-    return result
+    return {
+        "items": items,
+        "next_cursor": next_cursor
+    }
 
 # ================= APPROVE LEAVE =================
 @router.put("/leave/{leave_id}/approve")
 async def approve_leave(
     leave_id: int,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
 
     # Get leave
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.id == leave_id
-    ).first()
+    leave = await db.get(LeaveRequest, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
 
     # Approve leave using service
-    result = ApprovalService.approve_leave(
-        db,
+    result = await db.run_sync(
+        ApprovalService.approve_leave,
         leave_id,
         approver_role="ADMIN",
         approver_id=current_user.id
     )
 
-    # 🔥 Deduct Leave Balance After Approval
-    current_year = leave.start_date.year
-    current_quarter = (leave.start_date.month - 1) // 3 + 1
-
-    balance = db.query(LeaveBalance).filter(
-        LeaveBalance.user_id == leave.user_id,
-        LeaveBalance.leave_type == leave.leave_type,
-        LeaveBalance.year == current_year,
-        LeaveBalance.quarter == current_quarter
-    ).first()
-
-    if balance:
-        balance.remaining_leaves -= leave.number_of_days
-        balance.leaves_taken += leave.number_of_days
-
     # Log action
     log = LeaveLog(
         leave_id=leave_id,
@@ -104,25 +102,28 @@ async def approve_leave(
     )
 
     db.add(log)
-    db.commit()
 
-    # Send email
-    leave_owner = db.query(User).filter(
-        User.id == leave.user_id
-    ).first()
+    # Decision, log and queued email commit together below
+    leave_owner = await db.get(User, leave.user_id)
 
-    if leave_owner:
-        background_tasks.add_task(
-            send_email,
+    # Others get this in their next digest
+    if leave_owner and leave_owner.immediate_notifications:
+        NotificationService.notify(
             db,
+            "leave_decision",
             leave_owner.email,
-            "Leave Approved",
-            f"""
-Your leave from {leave.start_date} to {leave.end_date}
-has been approved by Admin.
-"""
+            {
+                "employee_name": leave_owner.name,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "outcome": "approved",
+                "decided_by": "Admin",
+                "remarks": None
+            }
         )
 
+    await db.commit()
+
     return result
 
 
@@ -130,23 +131,20 @@ has been approved by Admin.
 @router.put("/leave/{leave_id}/reject")
 async def reject_leave(
     leave_id: int,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.id == leave_id
-    ).first()
+    leave = await db.get(LeaveRequest, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
 
-    result = ApprovalService.reject_leave(
-        db,
+    result = await db.run_sync(
+        ApprovalService.reject_leave,
         leave_id,
         approver_role="ADMIN",
         approver_id=current_user.id
@@ -158,44 +156,96 @@ async def reject_leave(
         performed_by=current_user.id
     )
     db.add(log)
-    db.commit()
 
-    leave_owner = db.query(User).filter(
-        User.id == leave.user_id
-    ).first()
+    leave_owner = await db.get(User, leave.user_id)
 
-    if leave_owner:
-        background_tasks.add_task(
-            send_email,
+    # Others get this in their next digest
+    if leave_owner and leave_owner.immediate_notifications:
+        NotificationService.notify(
             db,
+            "leave_decision",
             leave_owner.email,
-            "Leave Rejected",
-            f"""
-Your leave from {leave.start_date} to {leave.end_date} 
-has been rejected by Admin.
-"""
+            {
+                "employee_name": leave_owner.name,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "outcome": "rejected",
+                "decided_by": "Admin",
+                "remarks": None
+            }
         )
 
+    await db.commit()
+
     return result
-@router.get("/export-leaves")
-def export_leaves(db: Session = Depends(get_db)):
 
-    leaves = db.query(LeaveRequest).all()
 
-    output = io.StringIO()
-    writer = csv.writer(output)
+# ================= BULK APPROVE / REJECT =================
+@router.post("/leaves/bulk-decision")
+def admin_bulk_decision(
+    request: BulkDecisionSchema,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
 
-    writer.writerow(["Employee", "Leave Type", "From", "To", "Status"])
+    results, decided = ApprovalService.bulk_decide(
+        db,
+        request.leave_ids,
+        request.decision,
+        approver_role="ADMIN",
+        approver_id=current_user.id,
+        remarks=request.remarks
+    )
 
-    for l in leaves:
-        writer.writerow([l.user_id, l.leave_type, l.start_date, l.end_date, l.status])
+    outcome = "approved" if request.decision == "approve" else "rejected"
+
+    NotificationService.notify_many(db, "leave_decision", [
+        (
+            item["employee_email"],
+            {
+                "employee_name": item["employee_name"],
+                "start_date": item["start_date"],
+                "end_date": item["end_date"],
+                "outcome": outcome,
+                "decided_by": "Admin",
+                "remarks": request.remarks
+            }
+        )
+        for item in decided
+        if item["immediate_notifications"]
+    ])
+    db.commit()
+
+    return {
+        "processed": len(decided),
+        "failed": len(results) - len(decided),
+        "results": results
+    }
+
+
+@router.get("/export-leaves")
+def export_leaves(
+    columns: str | None = None,
+    gzip: bool = False
+):
+
+    selected = ExportService.resolve_columns(
+        columns,
+        default=["user_id", "leave_type", "start_date", "end_date", "status"]
+    )
 
-    output.seek(0)
+    # Keep the original report headers for the default layout
+    headers = ["Employee", "Leave Type", "From", "To", "Status"] if not columns else None
+
+    media_type, response_headers = ExportService.response_meta("leaves.csv", gzip)
 
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=leaves.csv"}
+        ExportService.stream_csv(selected, headers=headers, compress=gzip),
+        media_type=media_type,
+        headers=response_headers
     )
 @router.get("/leave-reports")
 def leave_reports(
@@ -223,83 +273,112 @@ def export_filtered(
     month: int | None = None,
     employee_id: int | None = None,
     leave_type: str | None = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    columns: str | None = None,
+    gzip: bool = False,
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
-    query = db.query(LeaveRequest)
-
-    if month is not None:
-        query = query.filter(
-            func.extract("month", LeaveRequest.start_date) == month
-        )
-
-    if employee_id is not None:
-        query = query.filter(
-            LeaveRequest.user_id == employee_id
-        )
-
-    if leave_type is not None:
-        query = query.filter(
-            func.lower(LeaveRequest.leave_type) == leave_type.lower()
-        )
-
-    leaves = query.all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow([
-        "Leave ID",
-        "Employee ID",
-        "Leave Type",
-        "Start Date",
-        "End Date",
-        "Number of Days",
-        "Status",
-        "Reason"
-    ])
-
-    for leave in leaves:
-        writer.writerow([
-            leave.id,
-            leave.user_id,
-            leave.leave_type,
-            leave.start_date,
-            leave.end_date,
-            leave.number_of_days,
-            leave.status,
-            leave.reason
-        ])
+    selected = ExportService.resolve_columns(
+        columns,
+        default=[
+            "id",
+            "user_id",
+            "leave_type",
+            "start_date",
+            "end_date",
+            "number_of_days",
+            "status",
+            "reason"
+        ]
+    )
 
-    output.seek(0)
+    media_type, response_headers = ExportService.response_meta(
+        "leave_report.csv", gzip
+    )
 
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=leave_report.csv"
-        }
+        ExportService.stream_csv(
+            selected,
+            compress=gzip,
+            month=month,
+            user_id=employee_id,
+            leave_type=leave_type
+        ),
+        media_type=media_type,
+        headers=response_headers
     )
 @router.get("/leave-stats")
-def leave_stats(db: Session = Depends(get_db)):
+def leave_stats(
+    year: int | None = None,
+    from_year: int | None = None,
+    to_year: int | None = None,
+    db: Session = Depends(get_db)
+):
+
+    # Single year by default, or an inclusive range of years
+    if from_year is None and to_year is None:
+        from_year = to_year = year or date.today().year
+    else:
+        from_year = from_year or to_year
+        to_year = to_year or from_year
+
+    if from_year > to_year:
+        raise HTTPException(status_code=400, detail="Invalid year range")
 
-    results = db.query(
-        func.extract("month", LeaveRequest.start_date).label("month"),
-        func.count(LeaveRequest.id).label("total")
-    ).group_by("month").order_by("month").all()
+    results = LeaveStatsService.get_monthly_counts(db, from_year, to_year)
 
+    years = []
     months = []
     counts = []
 
-    for r in results:
-        months.append(int(r.month))
-        counts.append(r.total)
+    for r_year, r_month, total in results:
+        years.append(r_year)
+        months.append(r_month)
+        counts.append(total)
 
     return {
+        "years": years,
         "months": months,
         "counts": counts
     }
+
+
+# ================= REBUILD LEAVE STATS =================
+@router.post("/leave-stats/rebuild")
+def rebuild_leave_stats(
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    LeaveStatsService.rebuild_all(db)
+    db.commit()
+
+    return {"message": "Leave statistics rebuilt successfully"}
+
+
+# ================= PROVISION QUARTER BALANCES =================
+@router.post("/leave-balances/provision")
+def provision_leave_balances(
+    year: int,
+    quarter: int = Query(..., ge=1, le=4),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    created = BalanceProvisioningService.provision(db, year, quarter)
+    db.commit()
+
+    return {
+        "year": year,
+        "quarter": quarter,
+        "created": created
+    }
 from datetime import date, timedelta
 from pydantic import BaseModel
 
@@ -316,7 +395,7 @@ class ResignationRequest(BaseModel):
 def mark_user_resigned(
     data: ResignationRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
@@ -337,6 +416,7 @@ def mark_user_resigned(
     user.resignation_reason = data.reason
 
     db.commit()
+    invalidate_user(user.id)
 
     return {
         "message": "User placed in notice period",
@@ -347,7 +427,7 @@ def mark_user_resigned(
 @router.get("/employees")
 def get_all_employees(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
@@ -370,7 +450,7 @@ def get_all_employees(
 def register_employee(
     request: RegisterSchema,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "ADMIN":
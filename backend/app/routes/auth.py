@@ -1,39 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import date
-from fastapi_mail import FastMail, MessageSchema
-from passlib.context import CryptContext
 
-from backend.database.postgres import SessionLocal, get_db
+from backend.database.postgres import SessionLocal, get_async_db
 from backend.app.models.user import User
 from backend.app.schemas.auth_schema import ForgotPasswordSchema, ResetPasswordSchema
 from backend.app.utils.token import create_reset_token, verify_reset_token
-from backend.app.utils.auth_utils import verify_password, create_access_token
-from backend.app.email_config import conf
+from backend.app.utils.auth_utils import (
+    create_access_token,
+    invalidate_user,
+    hash_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash
+)
+from backend.app.utils.login_throttle import ConcurrencyLimiter
+from backend.app.service.notification_service import NotificationService
+from backend.app.config import LOGIN_MAX_CONCURRENT_PER_ACCOUNT, LOGIN_MAX_CONCURRENT_PER_IP
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 # ================= LOGIN =================
+account_limiter = ConcurrencyLimiter(LOGIN_MAX_CONCURRENT_PER_ACCOUNT)
+ip_limiter = ConcurrencyLimiter(LOGIN_MAX_CONCURRENT_PER_IP)
+
+
 @router.post("/login")
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
 
-    user = db.query(User).filter(
-        User.email == form_data.username
-    ).first()
+    client_ip = request.client.host if request.client else "unknown"
+
+    with ip_limiter.hold(client_ip), \
+            account_limiter.hold(form_data.username.lower()):
+        return await authenticate(form_data, db)
+
+
+async def authenticate(form_data: OAuth2PasswordRequestForm, db: AsyncSession):
+
+    user = (await db.execute(
+        select(User).where(User.email == form_data.username)
+    )).scalar_one_or_none()
 
     if not user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    if not verify_password(form_data.password, user.password):
+    if not await verify_password_async(form_data.password, user.password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    # Upgrade hashes made with an older bcrypt cost
+    if password_needs_rehash(user.password):
+        user.password = await hash_password_async(form_data.password)
+        await db.commit()
+
     today = date.today()
 
     if user.resignation_status == "notice_period":
@@ -42,7 +67,8 @@ def login(
 
             user.resignation_status = "resigned"
             user.is_active = False
-            db.commit()
+            await db.commit()
+            invalidate_user(user.id)
 
             raise HTTPException(
                 status_code=403,
@@ -74,7 +100,7 @@ def login(
 
 # ================= FORGOT PASSWORD =================
 @router.post("/forgot-password")
-async def forgot_password(data: ForgotPasswordSchema):
+def forgot_password(data: ForgotPasswordSchema):
 
     db = SessionLocal()
 
@@ -89,43 +115,13 @@ async def forgot_password(data: ForgotPasswordSchema):
 
         reset_link = f"http://localhost:5173/reset-password/{token}"
 
-        html = f"""
-        <html>
-        <body style="font-family: Arial; background:#f4f6f8; padding:20px;">
-            <div style="max-width:500px; background:white; padding:30px;
-                        border-radius:8px; margin:auto; text-align:center;">
-
-                <h2>Reset Your Password</h2>
-
-                <p>Hello {user.name},</p>
-
-                <p>You requested to reset your password.</p>
-
-                <a href="{reset_link}" 
-                   style="display:inline-block;padding:12px 20px;
-                   background:#1976d2;color:white;text-decoration:none;
-                   border-radius:5px;font-weight:bold;">
-                   Reset Password
-                </a>
-
-                <p style="margin-top:20px;">
-                    If you did not request this, please ignore this email.
-                </p>
-
-            </div>
-        </body>
-        </html>
-        """
-
-        message = MessageSchema(
-            subject="Reset Your Password",
-            recipients=[data.email],
-            body=html,
-            subtype="html"
+        NotificationService.notify(
+            db,
+            "password_reset",
+            user.email,
+            {"name": user.name, "reset_link": reset_link}
         )
-
-        fm = FastMail(conf)
-        await fm.send_message(message)
+        db.commit()
 
         return {"message": "Password reset link sent"}
 
@@ -151,7 +147,7 @@ def reset_password(data: ResetPasswordSchema):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        user.password = pwd_context.hash(data.new_password)
+        user.password = hash_password(data.new_password)
 
         db.commit()
 
@@ -3,8 +3,8 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from backend.database.postgres import get_db
 from backend.app.models.configuration import Configuration
-from backend.app.models.user import User
-from backend.app.utils.auth_utils import get_current_user
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
+from backend.app.service.config_service import ConfigService
 from backend.app.schemas.config import (
     ConfigCreate,
     ConfigUpdate,
@@ -20,7 +20,7 @@ router = APIRouter(
 @router.get("/", response_model=list[ConfigResponse])
 def get_all_configurations(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -33,7 +33,7 @@ def get_all_configurations(
 def add_configuration(
     request: ConfigCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -52,6 +52,7 @@ def add_configuration(
     )
 
     db.add(config)
+    ConfigService.invalidate(db)
     db.commit()
     db.refresh(config)
 
@@ -62,7 +63,7 @@ def update_configuration(
     config_id: int,
     request: ConfigUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -79,6 +80,7 @@ def update_configuration(
     config.updated_by = current_user.name
     config.updated_at = datetime.now()   # 🔥 Add this line
 
+    ConfigService.invalidate(db)
     db.commit()
     db.refresh(config)
 
@@ -87,7 +89,7 @@ def update_configuration(
 def delete_configuration(
     config_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     if current_user.role.upper() != "ADMIN":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -100,6 +102,7 @@ def delete_configuration(
         raise HTTPException(status_code=404, detail="Configuration not found")
 
     db.delete(config)
+    ConfigService.invalidate(db)
     db.commit()
 
     return {"message": "Configuration deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import date
 from backend.database.postgres import get_db
-from backend.app.models.leave_request import LeaveRequest
-from backend.app.models.user import User
-from backend.app.utils.auth_utils import get_current_user
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
+from backend.app.service.leave_stats_service import LeaveStatsService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -12,21 +11,14 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 @router.get("/summary")
 def get_dashboard_summary(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    total = db.query(func.count(LeaveRequest.id)).count()
+    counts = LeaveStatsService.get_status_counts(db)
 
-    approved = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "Approved"
-    ).count()
-
-    pending = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "Pending"
-    ).count()
-
-    rejected = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "Rejected"
-    ).count()
+    total = sum(counts.values())
+    approved = counts.get("Approved", 0)
+    pending = counts.get("Pending", 0)
+    rejected = counts.get("Rejected", 0)
 
     return {
         "total": total,
@@ -34,19 +26,17 @@ def get_dashboard_summary(
         "pending": pending,
         "rejected": rejected
     }
-from sqlalchemy import extract
-
 @router.get("/monthly-trend")
 def get_monthly_trend(
+    year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
-    results = db.query(
-        extract("month", LeaveRequest.start_date).label("month"),
-        func.count(LeaveRequest.id)
-    ).group_by("month").all()
+    year = year or date.today().year
 
-    trend = {int(month): count for month, count in results}
+    results = LeaveStatsService.get_monthly_counts(db, year, year)
+
+    trend = {month: total for _, month, total in results}
 
     # Ensure all 12 months exist
     final = []
@@ -55,10 +45,12 @@ def get_monthly_trend(
 
     return final
 @router.get("/admin-chart")
-def get_admin_chart(db: Session = Depends(get_db)):
-    result = db.query(
-        func.extract("month", LeaveRequest.start_date).label("month"),
-        func.count(LeaveRequest.id)
-    ).group_by("month").all()
+def get_admin_chart(
+    year: int | None = None,
+    db: Session = Depends(get_db)
+):
+    year = year or date.today().year
+
+    results = LeaveStatsService.get_monthly_counts(db, year, year)
 
-    return result
\ No newline at end of file
+    return [[month, total] for _, month, total in results]
\ No newline at end of file
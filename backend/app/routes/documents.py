@@ -0,0 +1,166 @@
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from starlette.concurrency import run_in_threadpool
+
+from backend.database.postgres import get_db
+from backend.app.models.document import Document
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.user import User
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
+from backend.app.service.thumbnail_service import ThumbnailService, THUMBNAIL_SIZES
+from backend.app.storage import ALLOWED_CONTENT_TYPES, get_storage
+from backend.app.storage.local import LocalStorage
+
+router = APIRouter(
+    prefix="/documents",
+    tags=["Documents"]
+)
+
+
+# Content under a hash never changes
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def get_accessible_document(db: Session, document_id: int, current_user: UserPrincipal) -> Document:
+    """
+    Admins see every document; others only proofs of their own leaves or of
+    their team's leaves
+    """
+
+    document = db.query(Document).filter(Document.id == document_id).first()
+
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    if current_user.role.upper() == "ADMIN":
+        return document
+
+    allowed = db.query(LeaveRequest.id).join(
+        User, User.id == LeaveRequest.user_id
+    ).filter(
+        LeaveRequest.document_id == document_id,
+        or_(
+            LeaveRequest.user_id == current_user.id,
+            User.manager_id == current_user.id
+        )
+    ).first()
+
+    if not allowed:
+        # Same answer as a missing document, so ids cannot be probed
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return document
+
+
+def not_modified(request: Request, etag: str):
+
+    if_none_match = request.headers.get("if-none-match", "")
+
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    return None
+
+
+# ================= DOWNLOAD DOCUMENT =================
+@router.get("/{document_id}")
+def get_document(
+    document_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    document = get_accessible_document(db, document_id, current_user)
+
+    etag = f'"{document.sha256}"'
+
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "X-Content-Type-Options": "nosniff"
+    }
+
+    # Only allowlisted types render inline; anything else (legacy HTML, SVG,
+    # unknown) is forced to download so it cannot run in our origin
+    if document.content_type in ALLOWED_CONTENT_TYPES:
+        media_type = document.content_type
+        disposition = "inline"
+    else:
+        media_type = "application/octet-stream"
+        disposition = "attachment"
+
+    storage = get_storage()
+
+    # Local files: zero-copy send where the server supports it, plus Range
+    if isinstance(storage, LocalStorage):
+        return FileResponse(
+            storage.path(document.storage_key),
+            media_type=media_type,
+            filename=document.filename,
+            content_disposition_type=disposition,
+            headers=headers
+        )
+
+    headers["Content-Disposition"] = disposition
+
+    if document.filename:
+        headers["Content-Disposition"] += f"; filename*=utf-8''{quote(document.filename)}"
+
+    return StreamingResponse(
+        storage.open(document.storage_key),
+        media_type=media_type,
+        headers=headers
+    )
+
+
+# ================= DOCUMENT THUMBNAIL =================
+@router.get("/{document_id}/thumbnail")
+async def get_document_thumbnail(
+    document_id: int,
+    request: Request,
+    size: int = 256,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    if size not in THUMBNAIL_SIZES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}"
+        )
+
+    document = await run_in_threadpool(
+        get_accessible_document, db, document_id, current_user
+    )
+
+    if not ThumbnailService.available(document):
+        raise HTTPException(status_code=415, detail="Preview not available for this document")
+
+    etag = f'"{document.sha256}-{size}"'
+
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    path = await run_in_threadpool(ThumbnailService.get_path, document, size)
+
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+            "X-Content-Type-Options": "nosniff"
+        }
+    )
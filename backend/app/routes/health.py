@@ -1,9 +1,28 @@
 # backend/routes/health.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+
+from backend.database.postgres import engine, async_engine
+from backend.database.pool_metrics import pool_status
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
 
 router = APIRouter()
 
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/db-pool")
+def db_pool_status(
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    # Pool sizes and wait times are operational detail, not public health
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine)
+    }
@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from sqlalchemy.orm import Session
+from datetime import date
+
+from backend.database.postgres import get_db
+from backend.app.models.holidays import Holiday
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
+from backend.app.schemas.holiday import HolidayCreate, HolidayResponse
+from backend.app.service.holiday_service import HolidayService
+from backend.app.service.holiday_calendar import HolidayCalendar
+
+router = APIRouter(
+    prefix="/admin/holidays",
+    tags=["Holidays"]
+)
+
+
+def require_admin(current_user: UserPrincipal):
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+
+# ================= LIST =================
+@router.get("/", response_model=list[HolidayResponse])
+def list_holidays(
+    year: int | None = None,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    require_admin(current_user)
+
+    query = db.query(Holiday)
+
+    if year is not None:
+        query = query.filter(
+            Holiday.date >= date(year, 1, 1),
+            Holiday.date < date(year + 1, 1, 1)
+        )
+
+    return query.order_by(Holiday.date).all()
+
+
+# ================= BULK IMPORT (JSON) =================
+@router.post("/import")
+def import_holidays(
+    holidays: list[HolidayCreate],
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    require_admin(current_user)
+
+    imported = HolidayService.bulk_upsert(
+        db, [holiday.model_dump() for holiday in holidays]
+    )
+
+    db.commit()
+    HolidayCalendar.invalidate()
+
+    return {"message": "Holidays imported successfully", "imported": imported}
+
+
+# ================= BULK IMPORT (CSV) =================
+@router.post("/import/csv")
+def import_holidays_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    require_admin(current_user)
+
+    rows = HolidayService.parse_csv(file.file.read())
+
+    imported = HolidayService.bulk_upsert(db, rows)
+
+    db.commit()
+    HolidayCalendar.invalidate()
+
+    return {"message": "Holidays imported successfully", "imported": imported}
+
+
+# ================= DELETE ONE =================
+@router.delete("/{holiday_id}")
+def delete_holiday(
+    holiday_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    require_admin(current_user)
+
+    holiday = db.query(Holiday).filter(Holiday.id == holiday_id).first()
+
+    if not holiday:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+
+    db.delete(holiday)
+    db.commit()
+    HolidayCalendar.invalidate()
+
+    return {"message": "Holiday deleted successfully"}
+
+
+# ================= DELETE YEAR =================
+@router.delete("/")
+def delete_holidays_for_year(
+    year: int,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    require_admin(current_user)
+
+    deleted = db.query(Holiday).filter(
+        Holiday.date >= date(year, 1, 1),
+        Holiday.date < date(year + 1, 1, 1)
+    ).delete(synchronize_session=False)
+
+    db.commit()
+    HolidayCalendar.invalidate()
+
+    return {"message": "Holidays deleted successfully", "deleted": deleted}
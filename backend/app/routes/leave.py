@@ -1,14 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
-import os
-import uuid
 
-from backend.database.postgres import get_db
+from backend.database.postgres import get_db, get_async_db
 from backend.app.models.leave_request import LeaveRequest
 from backend.app.models.leave_balance import LeaveBalance
 from backend.app.models.user import User
-from backend.app.utils.auth_utils import get_current_user
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
+from backend.app.service.leave_stats_service import LeaveStatsService
+from backend.app.service.document_service import DocumentService
+from backend.app.storage import get_storage, save_upload
+from backend.app.service.approval_service import ApprovalService
+from backend.app.service.leave_service import LeaveService
+from backend.app.service.leave_balance_service import LeaveBalanceService
+from backend.app.service.balance_provisioning_service import BalanceProvisioningService
+from backend.app.service.balance_ledger_service import BalanceLedgerService
+from backend.app.service.leave_validation_service import (
+    LeaveValidationService,
+    is_overlap_violation,
+    OVERLAP_DETAIL
+)
+from backend.app.schemas.leave_schema import LeaveValidateSchema, LeaveValidateBatchSchema
+from backend.app.service.notification_service import NotificationService
 
 router = APIRouter(
     prefix="/leave",
@@ -18,7 +34,7 @@ router = APIRouter(
 
 # ================= GET LEAVE TYPES =================
 @router.get("/types")
-def get_leave_types(current_user: User = Depends(get_current_user)):
+def get_leave_types(current_user: UserPrincipal = Depends(get_current_user)):
 
     types = ["CASUAL", "SICK", "EARNED", "LOSS_OF_PAY"]
 
@@ -35,7 +51,7 @@ def get_leave_types(current_user: User = Depends(get_current_user)):
 @router.get("/my")
 def get_my_leaves(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     leaves = db.query(LeaveRequest).filter(
@@ -48,44 +64,98 @@ def get_my_leaves(
 # ================= GET LEAVE BALANCE =================
 @router.get("/balance")
 def get_leave_balance(
+    year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
-    leave_types = ["CASUAL", "SICK", "EARNED", "LOSS_OF_PAY"]
+    return LeaveBalanceService.get_balance_summary(
+        db,
+        current_user.id,
+        current_user.gender,
+        year or date.today().year
+    )
 
-    if current_user.gender.upper() == "MALE":
-        leave_types.append("PATERNITY")
 
-    if current_user.gender.upper() == "FEMALE":
-        leave_types.extend(["MATERNITY", "PERIODS"])
+# ================= BALANCE LEDGER =================
+@router.get("/balance/ledger")
+def get_balance_ledger(
+    year: int | None = None,
+    leave_type: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    year = year or date.today().year
+
+    totals = BalanceLedgerService.current(db, current_user.id, year)
+
+    entries = BalanceLedgerService.history(db, current_user.id, year, leave_type)
+
+    return {
+        "balances": [
+            {
+                "leave_type": key_type,
+                "quarter": quarter,
+                "granted": granted,
+                "leaves_taken": taken,
+                "remaining_leaves": granted - taken
+            }
+            for (key_type, quarter), (granted, taken) in sorted(totals.items())
+            if leave_type is None or key_type == leave_type
+        ],
+        "entries": [
+            {
+                "id": entry.id,
+                "leave_type": entry.leave_type,
+                "quarter": entry.quarter,
+                "kind": entry.kind,
+                "granted_days": float(entry.granted_days),
+                "taken_days": float(entry.taken_days),
+                "leave_id": entry.leave_id,
+                "created_at": entry.created_at
+            }
+            for entry in entries
+        ]
+    }
+
+
+# ================= VALIDATE LEAVE =================
+@router.post("/validate")
+def validate_leave(
+    request: LeaveValidateSchema,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
 
-    balances = []
+    result = LeaveValidationService.validate(db, [
+        {"user_id": current_user.id, **request.model_dump()}
+    ])[0]
 
-    for leave_type in leave_types:
+    result.pop("index")
 
-        balance = db.query(LeaveBalance).filter(
-            LeaveBalance.user_id == current_user.id,
-            LeaveBalance.leave_type == leave_type
-        ).first()
+    return result
 
-        if balance:
 
-            balances.append({
-                "leave_type": balance.leave_type,
-                "leaves_taken": float(balance.leaves_taken),
-                "remaining_leaves": float(balance.remaining_leaves)
-            })
+@router.post("/validate/batch")
+def validate_leave_batch(
+    request: LeaveValidateBatchSchema,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
 
-        else:
+    if current_user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin access required")
 
-            balances.append({
-                "leave_type": leave_type,
-                "leaves_taken": 0,
-                "remaining_leaves": 0
-            })
+    results = LeaveValidationService.validate(
+        db, [item.model_dump() for item in request.items]
+    )
 
-    return balances
+    return {
+        "valid": sum(1 for r in results if r["valid"]),
+        "invalid": sum(1 for r in results if not r["valid"]),
+        "results": results
+    }
 
 
 # ================= APPLY LEAVE =================
@@ -96,120 +166,65 @@ async def apply_leave(
     end_date: date = Form(...),
     reason: str = Form(None),
     proof_document: UploadFile = File(None),
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     today = date.today()
 
-    # Block leave during notice period
-    if current_user.resignation_status == "notice_period":
-        if current_user.last_working_day and today <= current_user.last_working_day:
-            raise HTTPException(
-                status_code=400,
-                detail="You are in notice period. Leave cannot be applied."
-            )
-
-    if current_user.resignation_status == "resigned":
-        raise HTTPException(
-            status_code=403,
-            detail="You are no longer an active employee."
-        )
-
-    # Gender restrictions
-    if current_user.gender.upper() == "MALE" and leave_type in ["MATERNITY", "PERIODS"]:
-        raise HTTPException(
-            status_code=400,
-            detail="You are not eligible for this leave type."
-        )
-
-    if current_user.gender.upper() == "FEMALE" and leave_type == "PATERNITY":
-        raise HTTPException(
-            status_code=400,
-            detail="You are not eligible for this leave type."
-        )
-
-    # Date validation
-    if start_date > end_date:
-        raise HTTPException(status_code=400, detail="Invalid date range")
-
-    leave_days = (end_date - start_date).days + 1
-
-    # Sick leave rules
-    if leave_type == "SICK":
-
-        if start_date != today:
-            raise HTTPException(
-                status_code=400,
-                detail="Sick leave can only be applied for today."
-            )
+    errors = LeaveValidationService.rule_errors(
+        current_user,
+        leave_type,
+        start_date,
+        end_date,
+        bool(proof_document),
+        today
+    )
 
-        if leave_days > 2 and not proof_document:
-            raise HTTPException(
-                status_code=400,
-                detail="Medical proof required for sick leave more than 2 days."
-            )
+    if errors:
+        status_code, detail = errors[0]
+        raise HTTPException(status_code=status_code, detail=detail)
 
-    # Maternity/Paternity proof
-    if leave_type in ["MATERNITY", "PATERNITY"]:
-        if not proof_document:
-            raise HTTPException(
-                status_code=400,
-                detail="Proof document required."
-            )
-
-    # ================= LEAVE OVERLAP CHECK =================
-    overlapping_leave = db.query(LeaveRequest).filter(
-        LeaveRequest.user_id == current_user.id,
-        LeaveRequest.status.in_(["Pending", "Approved"]),
-        LeaveRequest.start_date <= end_date,
-        LeaveRequest.end_date >= start_date
-    ).first()
+    # Weekends and holidays are not charged, same as LeaveService
+    leave_days = await db.run_sync(
+        LeaveService.calculate_leave_days, start_date, end_date
+    )
 
-    if overlapping_leave:
+    if leave_days <= 0:
         raise HTTPException(
             status_code=400,
-            detail="Leave request overlaps with an existing leave"
+            detail="Selected dates contain no working days"
         )
 
     current_year = start_date.year
     current_quarter = (start_date.month - 1) // 3 + 1
 
-    balance = db.query(LeaveBalance).filter(
+    balance_query = select(LeaveBalance).where(
         LeaveBalance.user_id == current_user.id,
         LeaveBalance.leave_type == leave_type,
         LeaveBalance.year == current_year,
         LeaveBalance.quarter == current_quarter
-    ).first()
+    )
 
-    # ================= AUTO CREATE BALANCE =================
+    balance = (await db.execute(balance_query)).scalar_one_or_none()
+
+    # ================= PROVISION MISSING QUARTER =================
     if not balance:
 
-        default_leaves = {
-            "CASUAL": 6,
-            "SICK": 6,
-            "EARNED": 12,
-            "LOSS_OF_PAY": 0,
-            "PATERNITY": 15,
-            "MATERNITY": 180,
-            "PERIODS": 12
-        }
-
-        total = default_leaves.get(leave_type, 0)
-
-        balance = LeaveBalance(
-            user_id=current_user.id,
-            leave_type=leave_type,
-            year=current_year,
-            quarter=current_quarter,
-            leaves_taken=0,
-            remaining_leaves=total
+        await db.run_sync(
+            BalanceProvisioningService.provision,
+            current_year,
+            current_quarter,
+            current_user.id
         )
 
-        db.add(balance)
-        db.commit()
-        db.refresh(balance)
+        balance = (await db.execute(balance_query)).scalar_one_or_none()
+
+    if not balance:
+        raise HTTPException(
+            status_code=400,
+            detail="Leave balance not found for this leave type"
+        )
 
     if leave_days > float(balance.remaining_leaves):
         raise HTTPException(
@@ -219,18 +234,15 @@ async def apply_leave(
 
     # ================= SAVE FILE =================
     file_path = None
+    document_id = None
 
     if proof_document:
 
-        os.makedirs("uploads", exist_ok=True)
-
-        unique_name = f"{uuid.uuid4()}_{proof_document.filename}"
-        file_location = f"uploads/{unique_name}"
+        stored = await save_upload(get_storage(), proof_document)
 
-        with open(file_location, "wb") as buffer:
-            buffer.write(await proof_document.read())
+        document_id = await db.run_sync(DocumentService.register, stored)
 
-        file_path = file_location
+        file_path = stored.key
 
     # ================= CREATE LEAVE =================
     leave = LeaveRequest(
@@ -239,14 +251,48 @@ async def apply_leave(
         end_date=end_date,
         reason=reason,
         proof_document=file_path,
+        document_id=document_id,
         user_id=current_user.id,
         status="Pending",
         number_of_days=leave_days
     )
 
     db.add(leave)
-    db.commit()
-    db.refresh(leave)
+
+    # Overlaps are rejected by the ex_leave_requests_no_overlap constraint
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        await db.rollback()
+
+        if is_overlap_violation(e):
+            raise HTTPException(status_code=400, detail=OVERLAP_DETAIL)
+
+        raise
+
+    await db.run_sync(LeaveStatsService.record_transition, leave, None, leave.status)
+
+    # Managers who opted out of the digest hear about it right away
+    if current_user.manager_id:
+        manager = await db.get(User, current_user.manager_id)
+
+        if manager and manager.is_active and manager.immediate_notifications:
+            NotificationService.notify(
+                db,
+                "leave_applied",
+                manager.email,
+                {
+                    "name": manager.name,
+                    "employee_name": current_user.name,
+                    "leave_type": leave_type,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "number_of_days": leave_days,
+                    "reason": reason
+                }
+            )
+
+    await db.commit()
 
     return {"message": "Leave applied successfully"}
 
@@ -256,7 +302,7 @@ async def apply_leave(
 def manager_view_employee_balance(
     employee_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role != "MANAGER":
@@ -274,24 +320,8 @@ def manager_view_employee_balance(
 def cancel_leave(
     leave_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.id == leave_id
-    ).first()
-
-    if not leave:
-        raise HTTPException(status_code=404, detail="Leave not found")
-
-    if leave.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if leave.status == "Cancelled":
-        raise HTTPException(status_code=400, detail="Leave already cancelled")
-
-    leave.status = "Cancelled"
-
-    db.commit()
-
-    return {"message": "Leave cancelled successfully"}
\ No newline at end of file
+    # Restores the balance atomically when an approved leave is cancelled
+    return ApprovalService.cancel_leave(db, leave_id, current_user.id)
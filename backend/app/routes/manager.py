@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
 
-from backend.database.postgres import get_db
+from backend.database.postgres import get_db, get_async_db
 from backend.app.models.leave_request import LeaveRequest
 from backend.app.models.leave_logs import LeaveLog
 from backend.app.models.user import User
-from backend.app.utils.auth_utils import get_current_user
-from backend.app.utils.email_utils import send_email
+from backend.app.utils.auth_utils import get_current_user, UserPrincipal
 from backend.app.service.approval_service import ApprovalService
+from backend.app.service.notification_service import NotificationService
+from backend.app.service.leave_query_service import LeaveQueryService
+from backend.app.service.leave_balance_service import LeaveBalanceService
+from backend.app.schemas.leave_schema import BulkDecisionSchema
 
 router = APIRouter(
     prefix="/manager",
@@ -20,31 +26,30 @@ router = APIRouter(
 async def manager_approve_leave(
     leave_id: int,
     remarks: str = Body(None),
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "MANAGER":
         raise HTTPException(status_code=403, detail="Manager access required")
 
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.id == leave_id
-    ).first()
+    leave = await db.get(LeaveRequest, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
 
-    employee = db.query(User).filter(
-        User.id == leave.user_id,
-        User.manager_id == current_user.id
-    ).first()
+    employee = (await db.execute(
+        select(User).where(
+            User.id == leave.user_id,
+            User.manager_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not employee:
         raise HTTPException(status_code=403, detail="Not your team member")
 
-    result = ApprovalService.approve_leave(
-        db,
+    result = await db.run_sync(
+        ApprovalService.approve_leave,
         leave_id,
         approver_role="MANAGER",
         approver_id=current_user.id,
@@ -58,27 +63,25 @@ async def manager_approve_leave(
     )
 
     db.add(log)
-    db.commit()
 
-    # Send email notification
-    if background_tasks:
-        background_tasks.add_task(
-            send_email,
+    # Queue email with the log; others get this in their next digest
+    if employee.immediate_notifications:
+        NotificationService.notify(
             db,
+            "leave_decision",
             employee.email,
-            "Leave Approved",
-            f"""
-Hello {employee.name},
-
-Your leave from {leave.start_date} to {leave.end_date} has been approved.
-
-Remarks: {remarks if remarks else 'No remarks provided.'}
-
-Regards,
-HR Team
-"""
+            {
+                "employee_name": employee.name,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "outcome": "approved",
+                "decided_by": "your Manager",
+                "remarks": remarks
+            }
         )
 
+    await db.commit()
+
     return result
 
 
@@ -87,31 +90,30 @@ HR Team
 async def manager_reject_leave(
     leave_id: int,
     remarks: str = Body(None),
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "MANAGER":
         raise HTTPException(status_code=403, detail="Manager access required")
 
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.id == leave_id
-    ).first()
+    leave = await db.get(LeaveRequest, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
 
-    employee = db.query(User).filter(
-        User.id == leave.user_id,
-        User.manager_id == current_user.id
-    ).first()
+    employee = (await db.execute(
+        select(User).where(
+            User.id == leave.user_id,
+            User.manager_id == current_user.id
+        )
+    )).scalar_one_or_none()
 
     if not employee:
         raise HTTPException(status_code=403, detail="Not your team member")
 
-    result = ApprovalService.reject_leave(
-        db,
+    result = await db.run_sync(
+        ApprovalService.reject_leave,
         leave_id,
         approver_role="MANAGER",
         approver_id=current_user.id,
@@ -125,65 +127,117 @@ async def manager_reject_leave(
     )
 
     db.add(log)
-    db.commit()
 
-    if background_tasks:
-        background_tasks.add_task(
-            send_email,
+    # Others get this in their next digest
+    if employee.immediate_notifications:
+        NotificationService.notify(
             db,
+            "leave_decision",
             employee.email,
-            "Leave Rejected",
-            f"""
-Hello {employee.name},
+            {
+                "employee_name": employee.name,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "outcome": "rejected",
+                "decided_by": "your Manager",
+                "remarks": remarks
+            }
+        )
+
+    await db.commit()
+
+    return result
+
 
-Your leave from {leave.start_date} to {leave.end_date} has been rejected.
+# ================= BULK APPROVE / REJECT =================
+@router.post("/leaves/bulk-decision")
+def manager_bulk_decision(
+    request: BulkDecisionSchema,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    if current_user.role.upper() != "MANAGER":
+        raise HTTPException(status_code=403, detail="Manager access required")
 
-Remarks: {remarks if remarks else 'No remarks provided.'}
+    results, decided = ApprovalService.bulk_decide(
+        db,
+        request.leave_ids,
+        request.decision,
+        approver_role="MANAGER",
+        approver_id=current_user.id,
+        remarks=request.remarks
+    )
 
-Regards,
-HR Team
-"""
+    outcome = "approved" if request.decision == "approve" else "rejected"
+
+    NotificationService.notify_many(db, "leave_decision", [
+        (
+            item["employee_email"],
+            {
+                "employee_name": item["employee_name"],
+                "start_date": item["start_date"],
+                "end_date": item["end_date"],
+                "outcome": outcome,
+                "decided_by": "your Manager",
+                "remarks": request.remarks
+            }
         )
+        for item in decided
+        if item["immediate_notifications"]
+    ])
+    db.commit()
 
-    return result
+    return {
+        "processed": len(decided),
+        "failed": len(results) - len(decided),
+        "results": results
+    }
 
 
 # ================= TEAM LEAVES =================
 @router.get("/team")
 def get_team_leaves(
+    cursor: int | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    status: str = "Pending",
+    user_id: int | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    leave_type: str | None = None,
+    year: int | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role.upper() != "MANAGER":
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    leaves = (
-        db.query(LeaveRequest, User.name)
-        .join(User, LeaveRequest.user_id == User.id)
-        .filter(
-            User.manager_id == current_user.id,
-            LeaveRequest.status.ilike("pending")
-        )
-        .all()
+    items, next_cursor = LeaveQueryService.team_page(
+        db,
+        current_user.id,
+        limit=limit,
+        cursor=cursor,
+        # status=all for the full history
+        status=None if status.lower() == "all" else status,
+        user_id=user_id,
+        from_date=from_date,
+        to_date=to_date,
+        leave_type=leave_type
     )
 
-    result = []
+    # Team balances only with the first page
+    balances = None
 
-    for leave, name in leaves:
-
-        leave_dict = {
-            "id": leave.id,
-            "leave_type": leave.leave_type,
-            "start_date": leave.start_date,
-            "end_date": leave.end_date,
-            "number_of_days": leave.number_of_days,
-            "status": leave.status,
-            "reason": leave.reason,
-            "employee_name": name,
-            "proof_document": leave.proof_document
-        }
-
-        result.append(leave_dict)
+    if cursor is None:
+        balances = LeaveBalanceService.get_team_summary(
+            db,
+            current_user.id,
+            year or date.today().year
+        )
 
-    return result
\ No newline at end of file
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "balances": balances
+    }
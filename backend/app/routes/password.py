@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 import secrets
 from backend.database.postgres import get_db
 from backend.app.models.user import User
 from backend.app.models.password_reset import PasswordReset
-from backend.app.utils.email_utils import send_email
+from backend.app.service.notification_service import NotificationService
 from backend.app.utils.auth_utils import hash_password
 
 router = APIRouter(
@@ -17,7 +17,6 @@ router = APIRouter(
 @router.post("/forgot")
 async def forgot_password(
     email: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
 
@@ -36,18 +35,18 @@ async def forgot_password(
     )
 
     db.add(reset_entry)
-    db.commit()
 
     reset_link = f"http://localhost:3000/reset-password/{token}"
 
-    background_tasks.add_task(
-        send_email,
+    NotificationService.notify(
         db,
+        "password_reset",
         user.email,
-        "Password Reset Request",
-        f"Click this link to reset your password:\n{reset_link}"
+        {"name": user.name, "reset_link": reset_link}
     )
 
+    db.commit()
+
     return {"message": "Password reset email sent"}
 
 
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from datetime import date
 
 from backend.database.postgres import get_db
 from backend.app.models.user import User
-from backend.app.models.leave_balance import LeaveBalance
+from backend.app.service.balance_provisioning_service import BalanceProvisioningService
 from backend.app.schemas.user_schema import UserCreate
-from backend.app.utils.auth_utils import hash_password, get_current_user
+from backend.app.utils.auth_utils import (
+    hash_password,
+    get_current_user,
+    invalidate_user,
+    UserPrincipal
+)
 
 router = APIRouter(
     prefix="/users",
@@ -40,15 +46,18 @@ def register_user(
     is_active=True
 )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    db.flush()
 
-    # Create leave balance
-    leave_balance = LeaveBalance(
+    # Create this quarter's leave balances with the user, in one transaction
+    today = date.today()
+
+    BalanceProvisioningService.provision(
+        db,
+        today.year,
+        (today.month - 1) // 3 + 1,
         user_id=new_user.id
     )
 
-    db.add(leave_balance)
     db.commit()
 
     return {
@@ -58,7 +67,7 @@ def register_user(
 # ---------------- CURRENT USER PROFILE ----------------
 @router.get("/me")
 def get_my_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     return {
         "id": current_user.id,
@@ -67,6 +76,27 @@ def get_my_profile(
         "role": current_user.role,
         "is_active": current_user.is_active
     }
+
+
+# ---------------- NOTIFICATION PREFERENCE ----------------
+@router.put("/me/notifications")
+def update_notification_preference(
+    immediate: bool,
+    db: Session = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+
+    db.query(User).filter(User.id == current_user.id).update(
+        {User.immediate_notifications: immediate},
+        synchronize_session=False
+    )
+    db.commit()
+
+    return {
+        "immediate_notifications": immediate
+    }
+
+
 @router.get("/managers")
 def get_managers(db: Session = Depends(get_db)):
 
@@ -83,7 +113,7 @@ def get_managers(db: Session = Depends(get_db)):
 @router.get("/employees")
 def get_all_employees(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role != "ADMIN":
@@ -109,7 +139,7 @@ def update_employee_manager(
     employee_id: int,
     manager_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role != "ADMIN":
@@ -122,6 +152,7 @@ def update_employee_manager(
 
     employee.manager_id = manager_id
     db.commit()
+    invalidate_user(employee_id)
 
     return {"message": "Manager updated successfully"}
 
@@ -131,7 +162,7 @@ def update_employee_manager(
 def deactivate_employee(
     employee_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
 
     if current_user.role != "ADMIN":
@@ -144,5 +175,6 @@ def deactivate_employee(
 
     employee.is_active = False
     db.commit()
+    invalidate_user(employee_id)
 
     return {"message": "Employee deactivated"}
\ No newline at end of file
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import date
+
+
+class HolidayCreate(BaseModel):
+    date: date
+    name: str
+
+
+class HolidayResponse(HolidayCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
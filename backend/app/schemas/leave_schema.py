@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
-from typing import Optional
+from typing import Optional, Literal
 
 class LeaveCreate(BaseModel):
     leave_type: str
@@ -8,3 +8,24 @@ class LeaveCreate(BaseModel):
     end_date: date
     reason: Optional[str] = None
     proof_document: Optional[str] = None  # NEW FIELD
+
+
+class BulkDecisionSchema(BaseModel):
+    leave_ids: list[int] = Field(..., min_length=1, max_length=500)
+    decision: Literal["approve", "reject"]
+    remarks: Optional[str] = None
+
+
+class LeaveValidateSchema(BaseModel):
+    leave_type: str
+    start_date: date
+    end_date: date
+    has_proof: bool = False
+
+
+class LeaveValidateItem(LeaveValidateSchema):
+    user_id: int
+
+
+class LeaveValidateBatchSchema(BaseModel):
+    items: list[LeaveValidateItem] = Field(..., min_length=1, max_length=1000)
@@ -1,19 +1,115 @@
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import tuple_, update, select, func
 from datetime import datetime
 import pytz
 
 from backend.app.models.leave_request import LeaveRequest
 from backend.app.models.leave_balance import LeaveBalance
 from backend.app.models.user import User
+from backend.app.models.leave_logs import LeaveLog
+from backend.app.service.leave_stats_service import LeaveStatsService
+from backend.app.service.leave_balance_service import LeaveBalanceService
+from backend.app.service.balance_ledger_service import BalanceLedgerService
 
 
 # IST timezone
 ist = pytz.timezone("Asia/Kolkata")
 
 
+def balance_filter(leave: LeaveRequest):
+    # Balance row for the leave's type and start quarter
+    return (
+        LeaveBalance.user_id == leave.user_id,
+        LeaveBalance.leave_type == leave.leave_type,
+        LeaveBalance.year == leave.start_date.year,
+        LeaveBalance.quarter == (leave.start_date.month - 1) // 3 + 1
+    )
+
+
 class ApprovalService:
 
+    # ================= BALANCE MUTATIONS =================
+    @staticmethod
+    def deduct_balance(
+        db: Session,
+        leave: LeaveRequest,
+        leave_days: float,
+        performed_by: int | None = None
+    ):
+        """
+        Atomically deduct leave days; the WHERE clause guards against overdraw
+        """
+
+        remaining = db.execute(
+            update(LeaveBalance)
+            .where(*balance_filter(leave), LeaveBalance.remaining_leaves >= leave_days)
+            .values(
+                leaves_taken=LeaveBalance.leaves_taken + leave_days,
+                remaining_leaves=LeaveBalance.remaining_leaves - leave_days
+            )
+            .returning(LeaveBalance.remaining_leaves)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+
+        if remaining is not None:
+            BalanceLedgerService.record(
+                db, leave, "deduct", taken_days=leave_days, performed_by=performed_by
+            )
+            LeaveBalanceService.invalidate(db, leave.user_id)
+            return remaining
+
+        exists = db.query(LeaveBalance.id).filter(*balance_filter(leave)).first()
+
+        if not exists:
+            raise HTTPException(
+                status_code=400,
+                detail="Leave balance not initialized for this quarter"
+            )
+
+        raise HTTPException(
+            status_code=400,
+            detail="Insufficient leave balance"
+        )
+
+    @staticmethod
+    def restore_balance(
+        db: Session,
+        leave: LeaveRequest,
+        leave_days: float,
+        performed_by: int | None = None
+    ):
+        """
+        Give back up to leave_days, never more than was taken, and record
+        exactly what was applied so the ledger and projection agree
+        """
+
+        # Locked read of the amount that can actually be restored
+        restorable = select(
+            LeaveBalance.id,
+            func.least(func.coalesce(LeaveBalance.leaves_taken, 0), leave_days).label("days")
+        ).where(*balance_filter(leave)).with_for_update().subquery()
+
+        restored = db.execute(
+            update(LeaveBalance)
+            .where(LeaveBalance.id == restorable.c.id)
+            .values(
+                leaves_taken=LeaveBalance.leaves_taken - restorable.c.days,
+                remaining_leaves=LeaveBalance.remaining_leaves + restorable.c.days
+            )
+            .returning(restorable.c.days)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+
+        # No balance row, or nothing taken: nothing to record
+        if not restored:
+            return
+
+        BalanceLedgerService.record(
+            db, leave, "restore", taken_days=-restored, performed_by=performed_by
+        )
+        LeaveBalanceService.invalidate(db, leave.user_id)
+
     # ================= APPROVE =================
     @staticmethod
     def approve_leave(
@@ -24,9 +120,10 @@ class ApprovalService:
         remarks: str = None
     ):
 
+        # Row lock so two approvers cannot both process the same leave
         leave = db.query(LeaveRequest).filter(
             LeaveRequest.id == leave_id
-        ).first()
+        ).with_for_update().populate_existing().first()
 
         if not leave:
             raise HTTPException(status_code=404, detail="Leave request not found")
@@ -47,22 +144,6 @@ class ApprovalService:
                     detail="You can only approve leaves of your assigned employees"
                 )
 
-        year = leave.start_date.year
-        quarter = (leave.start_date.month - 1) // 3 + 1
-
-        balance = db.query(LeaveBalance).filter(
-            LeaveBalance.user_id == leave.user_id,
-            LeaveBalance.leave_type == leave.leave_type,
-            LeaveBalance.year == year,
-            LeaveBalance.quarter == quarter
-        ).first()
-
-        if not balance:
-            raise HTTPException(
-                status_code=400,
-                detail="Leave balance not initialized for this quarter"
-            )
-
         leave_days = float(leave.number_of_days or 0)
 
         if leave_days <= 0:
@@ -71,15 +152,9 @@ class ApprovalService:
                 detail="Invalid leave duration"
             )
 
-        if leave_days > float(balance.remaining_leaves):
-            raise HTTPException(
-                status_code=400,
-                detail="Insufficient leave balance"
-            )
+        ApprovalService.deduct_balance(db, leave, leave_days, performed_by=approver_id)
 
-        # Deduct leave balance
-        balance.leaves_taken = float(balance.leaves_taken) + leave_days
-        balance.remaining_leaves = float(balance.remaining_leaves) - leave_days
+        LeaveStatsService.record_transition(db, leave, leave.status, "Approved")
 
         # Update leave record
         leave.status = "Approved"
@@ -88,8 +163,8 @@ class ApprovalService:
         leave.approved_on = datetime.now(ist)
         leave.remarks = remarks
 
-        db.commit()
-        db.refresh(leave)
+        # The route commits once, together with its audit log and email
+        db.flush()
 
         return {"message": "Leave approved successfully"}
 
@@ -105,7 +180,7 @@ class ApprovalService:
 
         leave = db.query(LeaveRequest).filter(
             LeaveRequest.id == leave_id
-        ).first()
+        ).with_for_update().populate_existing().first()
 
         if not leave:
             raise HTTPException(status_code=404, detail="Leave request not found")
@@ -126,14 +201,16 @@ class ApprovalService:
                     detail="You can only reject leaves of your assigned employees"
                 )
 
+        LeaveStatsService.record_transition(db, leave, leave.status, "Rejected")
+
         leave.status = "Rejected"
         leave.approved_by = approver_id
         leave.approved_by_role = approver_role
         leave.approved_on = datetime.now(ist)
         leave.remarks = remarks
 
-        db.commit()
-        db.refresh(leave)
+        # The route commits once, together with its audit log and email
+        db.flush()
 
         return {"message": "Leave rejected successfully"}
 
@@ -143,7 +220,7 @@ class ApprovalService:
 
         leave = db.query(LeaveRequest).filter(
             LeaveRequest.id == leave_id
-        ).first()
+        ).with_for_update().populate_existing().first()
 
         if not leave:
             raise HTTPException(status_code=404, detail="Leave request not found")
@@ -165,29 +242,173 @@ class ApprovalService:
 
         # Restore balance if approved leave is cancelled
         if leave.status == "Approved":
+            ApprovalService.restore_balance(
+                db, leave, float(leave.number_of_days or 0), performed_by=user_id
+            )
 
-            year = leave.start_date.year
-            quarter = (leave.start_date.month - 1) // 3 + 1
-            leave_days = float(leave.number_of_days or 0)
-
-            balance = db.query(LeaveBalance).filter(
-                LeaveBalance.user_id == leave.user_id,
-                LeaveBalance.leave_type == leave.leave_type,
-                LeaveBalance.year == year,
-                LeaveBalance.quarter == quarter
-            ).first()
-
-            if balance:
-
-                balance.leaves_taken = max(
-                    0,
-                    float(balance.leaves_taken) - leave_days
-                )
-
-                balance.remaining_leaves = float(balance.remaining_leaves) + leave_days
+        LeaveStatsService.record_transition(db, leave, leave.status, "Cancelled")
 
         leave.status = "Cancelled"
 
         db.commit()
 
-        return {"message": "Leave cancelled successfully"}
\ No newline at end of file
+        return {"message": "Leave cancelled successfully"}
+
+    # ================= BULK APPROVE / REJECT =================
+    @staticmethod
+    def bulk_decide(
+        db: Session,
+        leave_ids: list[int],
+        decision: str,
+        approver_role: str,
+        approver_id: int,
+        remarks: str = None
+    ):
+        """
+        Approve or reject many leaves in the caller's transaction.
+
+        Leaves, employees and balances are each loaded with one query;
+        leaves and balances are locked FOR UPDATE (in id order) until commit.
+        Returns (results, decided) where results has one entry per requested
+        id and decided holds plain notification data for every changed leave.
+        The caller queues its emails and commits once.
+        """
+
+        approve = decision == "approve"
+        new_status = "Approved" if approve else "Rejected"
+        is_manager = approver_role.upper() == "MANAGER"
+
+        # Keep request order, drop duplicates
+        leave_ids = list(dict.fromkeys(leave_ids))
+
+        leaves = {
+            leave.id: leave
+            for leave in db.query(LeaveRequest).filter(
+                LeaveRequest.id.in_(leave_ids)
+            ).order_by(LeaveRequest.id).with_for_update().populate_existing().all()
+        }
+
+        employees = {
+            user.id: user
+            for user in db.query(User).filter(
+                User.id.in_({leave.user_id for leave in leaves.values()})
+            ).all()
+        }
+
+        balances = {}
+
+        if approve:
+            keys = {
+                (
+                    leave.user_id,
+                    leave.leave_type,
+                    leave.start_date.year,
+                    (leave.start_date.month - 1) // 3 + 1
+                )
+                for leave in leaves.values()
+            }
+
+            if keys:
+                balances = {
+                    (b.user_id, b.leave_type, b.year, b.quarter): b
+                    for b in db.query(LeaveBalance).filter(
+                        tuple_(
+                            LeaveBalance.user_id,
+                            LeaveBalance.leave_type,
+                            LeaveBalance.year,
+                            LeaveBalance.quarter
+                        ).in_(keys)
+                    ).order_by(LeaveBalance.id).with_for_update().populate_existing().all()
+                }
+
+        action = f"{new_status} by {approver_role.capitalize()}"
+        if remarks:
+            action = f"{action}. Remarks: {remarks}"
+
+        results = []
+        decided = []
+        transitions = []
+        now = datetime.now(ist)
+
+        for leave_id in leave_ids:
+
+            leave = leaves.get(leave_id)
+
+            def fail(detail):
+                results.append({"leave_id": leave_id, "status": "error", "detail": detail})
+
+            if not leave:
+                fail("Leave request not found")
+                continue
+
+            if leave.status.lower() != "pending":
+                fail("Leave already processed")
+                continue
+
+            employee = employees.get(leave.user_id)
+
+            if is_manager and (not employee or employee.manager_id != approver_id):
+                fail("You can only process leaves of your assigned employees")
+                continue
+
+            if approve:
+                balance = balances.get((
+                    leave.user_id,
+                    leave.leave_type,
+                    leave.start_date.year,
+                    (leave.start_date.month - 1) // 3 + 1
+                ))
+
+                if not balance:
+                    fail("Leave balance not initialized for this quarter")
+                    continue
+
+                leave_days = float(leave.number_of_days or 0)
+
+                if leave_days <= 0:
+                    fail("Invalid leave duration")
+                    continue
+
+                if leave_days > float(balance.remaining_leaves):
+                    fail("Insufficient leave balance")
+                    continue
+
+                balance.leaves_taken = float(balance.leaves_taken) + leave_days
+                balance.remaining_leaves = float(balance.remaining_leaves) - leave_days
+
+                BalanceLedgerService.record(
+                    db, leave, "deduct", taken_days=leave_days, performed_by=approver_id
+                )
+
+            transitions.append((leave, leave.status, new_status))
+
+            leave.status = new_status
+            leave.approved_by = approver_id
+            leave.approved_by_role = approver_role
+            leave.approved_on = now
+            leave.remarks = remarks
+
+            db.add(LeaveLog(
+                leave_id=leave.id,
+                action=action,
+                performed_by=approver_id
+            ))
+
+            results.append({"leave_id": leave_id, "status": new_status.lower()})
+            decided.append({
+                "leave_id": leave.id,
+                "user_id": leave.user_id,
+                "start_date": leave.start_date,
+                "end_date": leave.end_date,
+                "employee_name": employee.name if employee else None,
+                "employee_email": employee.email if employee else None,
+                "immediate_notifications": bool(employee and employee.immediate_notifications)
+            })
+
+        # One upsert per rollup table for the whole batch
+        LeaveStatsService.record_transitions(db, transitions)
+
+        if approve:
+            LeaveBalanceService.invalidate(db, *{item["user_id"] for item in decided})
+
+        return results, decided
@@ -0,0 +1,240 @@
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, and_, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app.models.leave_balance import LeaveBalance
+from backend.app.models.leave_balance_ledger import LeaveBalanceEntry, LeaveBalanceSnapshot
+from backend.app.config import LEDGER_COMPACT_AFTER_HOURS
+
+
+# Only one process compacts at a time
+LEDGER_COMPACT_LOCK_ID = 7413023
+
+BALANCE_KEY = ("user_id", "leave_type", "year", "quarter")
+
+
+def ledger_delta():
+    """
+    Per-balance totals of the entries not yet folded into a snapshot
+    """
+
+    return select(
+        LeaveBalanceEntry.user_id,
+        LeaveBalanceEntry.leave_type,
+        LeaveBalanceEntry.year,
+        LeaveBalanceEntry.quarter,
+        func.sum(LeaveBalanceEntry.granted_days).label("granted_days"),
+        func.sum(LeaveBalanceEntry.taken_days).label("taken_days"),
+        func.max(LeaveBalanceEntry.id).label("last_entry_id")
+    ).outerjoin(
+        LeaveBalanceSnapshot,
+        and_(*[
+            getattr(LeaveBalanceSnapshot, key) == getattr(LeaveBalanceEntry, key)
+            for key in BALANCE_KEY
+        ])
+    ).where(
+        LeaveBalanceEntry.id > func.coalesce(LeaveBalanceSnapshot.last_entry_id, 0)
+    ).group_by(
+        LeaveBalanceEntry.user_id,
+        LeaveBalanceEntry.leave_type,
+        LeaveBalanceEntry.year,
+        LeaveBalanceEntry.quarter
+    )
+
+
+class BalanceLedgerService:
+
+    # ================= APPEND =================
+    @staticmethod
+    def record(
+        db: Session,
+        leave,
+        kind: str,
+        granted_days: float = 0,
+        taken_days: float = 0,
+        performed_by: int | None = None
+    ):
+        """
+        Append an entry for the balance a leave request draws from
+        """
+
+        db.add(LeaveBalanceEntry(
+            user_id=leave.user_id,
+            leave_type=leave.leave_type,
+            year=leave.start_date.year,
+            quarter=(leave.start_date.month - 1) // 3 + 1,
+            kind=kind,
+            granted_days=granted_days,
+            taken_days=taken_days,
+            leave_id=leave.id,
+            performed_by=performed_by
+        ))
+
+    # ================= READ =================
+    @staticmethod
+    def current(db: Session, user_id: int, year: int) -> dict:
+        """
+        {(leave_type, quarter): (granted, taken)} as snapshot + delta
+        """
+
+        totals = {}
+
+        snapshots = db.query(LeaveBalanceSnapshot).filter(
+            LeaveBalanceSnapshot.user_id == user_id,
+            LeaveBalanceSnapshot.year == year
+        )
+
+        for snapshot in snapshots:
+            totals[(snapshot.leave_type, snapshot.quarter)] = (
+                float(snapshot.granted_days),
+                float(snapshot.taken_days)
+            )
+
+        delta = ledger_delta().where(
+            LeaveBalanceEntry.user_id == user_id,
+            LeaveBalanceEntry.year == year
+        )
+
+        for row in db.execute(delta):
+            granted, taken = totals.get((row.leave_type, row.quarter), (0.0, 0.0))
+            totals[(row.leave_type, row.quarter)] = (
+                granted + float(row.granted_days),
+                taken + float(row.taken_days)
+            )
+
+        return totals
+
+    @staticmethod
+    def history(
+        db: Session,
+        user_id: int,
+        year: int,
+        leave_type: str | None = None
+    ):
+
+        query = db.query(LeaveBalanceEntry).filter(
+            LeaveBalanceEntry.user_id == user_id,
+            LeaveBalanceEntry.year == year
+        )
+
+        if leave_type is not None:
+            query = query.filter(LeaveBalanceEntry.leave_type == leave_type)
+
+        return query.order_by(LeaveBalanceEntry.id).all()
+
+    # ================= COMPACT =================
+    @staticmethod
+    def compact(db: Session) -> int:
+        """
+        Fold entries older than LEDGER_COMPACT_AFTER_HOURS into the snapshots.
+
+        Entries stay in the ledger for audits; the snapshot only moves the
+        point reads start summing from. The age cut-off keeps entries from
+        transactions still in flight out of the fold.
+        Returns the number of snapshots written.
+        """
+
+        locked = db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:id)"),
+            {"id": LEDGER_COMPACT_LOCK_ID}
+        ).scalar()
+
+        if not locked:
+            return 0
+
+        cutoff = func.now() - timedelta(hours=LEDGER_COMPACT_AFTER_HOURS)
+
+        # Fold by id so no entry below the boundary is ever skipped
+        fold_up_to = db.query(func.max(LeaveBalanceEntry.id)).filter(
+            LeaveBalanceEntry.created_at < cutoff
+        ).scalar()
+
+        if fold_up_to is None:
+            db.commit()
+            return 0
+
+        delta = ledger_delta().where(
+            LeaveBalanceEntry.id <= fold_up_to
+        ).subquery()
+
+        Snapshot = LeaveBalanceSnapshot.__table__
+
+        stmt = insert(Snapshot).from_select(
+            [*BALANCE_KEY, "granted_days", "taken_days", "last_entry_id"],
+            select(
+                delta.c.user_id,
+                delta.c.leave_type,
+                delta.c.year,
+                delta.c.quarter,
+                delta.c.granted_days,
+                delta.c.taken_days,
+                delta.c.last_entry_id
+            )
+        )
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(BALANCE_KEY),
+            set_={
+                "granted_days": Snapshot.c.granted_days + stmt.excluded.granted_days,
+                "taken_days": Snapshot.c.taken_days + stmt.excluded.taken_days,
+                "last_entry_id": stmt.excluded.last_entry_id,
+                "updated_at": func.now()
+            }
+        )
+
+        written = db.execute(stmt).rowcount
+        db.commit()
+
+        return written
+
+    # ================= PROJECTION =================
+    @staticmethod
+    def rebuild_projection(db: Session) -> int:
+        """
+        Reset leave_balances from snapshot + delta; returns rows corrected
+        """
+
+        delta = ledger_delta().subquery()
+
+        totals = select(
+            func.coalesce(LeaveBalanceSnapshot.user_id, delta.c.user_id).label("user_id"),
+            func.coalesce(LeaveBalanceSnapshot.leave_type, delta.c.leave_type).label("leave_type"),
+            func.coalesce(LeaveBalanceSnapshot.year, delta.c.year).label("year"),
+            func.coalesce(LeaveBalanceSnapshot.quarter, delta.c.quarter).label("quarter"),
+            (
+                func.coalesce(LeaveBalanceSnapshot.granted_days, 0) +
+                func.coalesce(delta.c.granted_days, 0)
+            ).label("granted"),
+            (
+                func.coalesce(LeaveBalanceSnapshot.taken_days, 0) +
+                func.coalesce(delta.c.taken_days, 0)
+            ).label("taken")
+        ).select_from(
+            LeaveBalanceSnapshot.__table__.join(
+                delta,
+                and_(*[
+                    getattr(LeaveBalanceSnapshot, key) == getattr(delta.c, key)
+                    for key in BALANCE_KEY
+                ]),
+                full=True
+            )
+        ).subquery()
+
+        corrected = db.execute(
+            update(LeaveBalance)
+            .where(
+                *[getattr(LeaveBalance, key) == getattr(totals.c, key) for key in BALANCE_KEY],
+                (LeaveBalance.leaves_taken != totals.c.taken) |
+                (LeaveBalance.remaining_leaves != totals.c.granted - totals.c.taken)
+            )
+            .values(
+                leaves_taken=totals.c.taken,
+                remaining_leaves=totals.c.granted - totals.c.taken
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        db.commit()
+
+        return corrected
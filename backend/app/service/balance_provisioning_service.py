@@ -0,0 +1,154 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, func, and_, or_, literal, values, column, union_all, String, Integer, Numeric
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app.models.user import User
+from backend.app.models.leave_balance import LeaveBalance
+from backend.app.models.leave_balance_ledger import LeaveBalanceEntry
+from backend.app.service.config_service import ConfigService
+from backend.app.service.leave_balance_service import (
+    LeaveBalanceService,
+    DEFAULT_QUARTERLY_ALLOWANCES,
+    LEAVE_TYPE_GENDERS
+)
+
+
+def previous_quarter(year: int, quarter: int):
+    return (year - 1, 4) if quarter == 1 else (year, quarter - 1)
+
+
+class BalanceProvisioningService:
+
+    # ================= RULES =================
+    @staticmethod
+    def allowance_rules(db: Session) -> list[tuple]:
+        """
+        (leave_type, allowance, max carry forward, gender) per leave type.
+
+        Configuration overrides: "<type>_quarterly_allowance" and
+        "<type>_max_carry_forward" (unused days carried from the previous
+        quarter, 0 disables carry forward).
+        """
+
+        rules = []
+
+        for leave_type, default in DEFAULT_QUARTERLY_ALLOWANCES.items():
+
+            key = leave_type.lower()
+
+            rules.append((
+                leave_type,
+                ConfigService.get_float(f"{key}_quarterly_allowance", default, db=db),
+                ConfigService.get_float(f"{key}_max_carry_forward", 0, db=db),
+                LEAVE_TYPE_GENDERS.get(leave_type)
+            ))
+
+        return rules
+
+    # ================= PROVISION =================
+    @staticmethod
+    def provision(
+        db: Session,
+        year: int,
+        quarter: int,
+        user_id: int | None = None
+    ) -> int:
+        """
+        Create the quarter's balance rows for every active user (or one user)
+        in a single INSERT ... SELECT. Existing rows are left untouched.
+        Returns the number of rows created (caller commits).
+        """
+
+        rules = values(
+            column("leave_type", String),
+            column("allowance", Numeric),
+            column("carry_cap", Numeric),
+            column("gender", String),
+            name="rules"
+        ).data(BalanceProvisioningService.allowance_rules(db))
+
+        prev_year, prev_quarter = previous_quarter(year, quarter)
+        Previous = aliased(LeaveBalance)
+
+        carried = func.least(
+            func.greatest(func.coalesce(Previous.remaining_leaves, 0), 0),
+            rules.c.carry_cap
+        )
+
+        query = select(
+            User.id,
+            rules.c.leave_type,
+            literal(year, Integer),
+            literal(quarter, Integer),
+            literal(0, Numeric),
+            rules.c.allowance + carried
+        ).join(
+            rules,
+            or_(
+                rules.c.gender.is_(None),
+                func.upper(User.gender) == rules.c.gender
+            )
+        ).outerjoin(
+            Previous,
+            and_(
+                Previous.user_id == User.id,
+                Previous.leave_type == rules.c.leave_type,
+                Previous.year == prev_year,
+                Previous.quarter == prev_quarter
+            )
+        ).where(
+            User.is_active.is_(True),
+            or_(
+                User.resignation_status.is_(None),
+                User.resignation_status != "resigned"
+            )
+        )
+
+        if user_id is not None:
+            query = query.where(User.id == user_id)
+
+        created = insert(LeaveBalance).from_select(
+            ["user_id", "leave_type", "year", "quarter", "leaves_taken", "remaining_leaves"],
+            query
+        ).on_conflict_do_nothing(
+            constraint="uq_leave_balances_key"
+        ).returning(
+            LeaveBalance.user_id,
+            LeaveBalance.leave_type,
+            LeaveBalance.year,
+            LeaveBalance.quarter,
+            LeaveBalance.remaining_leaves
+        ).cte("created")
+
+        # Ledger entries for the rows actually created, in the same statement
+        def entries(kind, granted):
+            return select(
+                created.c.user_id,
+                created.c.leave_type,
+                created.c.year,
+                created.c.quarter,
+                literal(kind, String),
+                granted,
+                literal(0, Numeric)
+            ).join(rules, rules.c.leave_type == created.c.leave_type)
+
+        carried_over = created.c.remaining_leaves - rules.c.allowance
+
+        ledger = insert(LeaveBalanceEntry).from_select(
+            ["user_id", "leave_type", "year", "quarter", "kind", "granted_days", "taken_days"],
+            union_all(
+                entries("grant", rules.c.allowance),
+                entries("carry_forward", carried_over).where(carried_over > 0)
+            )
+        ).cte("ledger")
+
+        created = db.execute(
+            select(func.count()).select_from(created).add_cte(ledger)
+        ).scalar()
+
+        if user_id is not None:
+            LeaveBalanceService.invalidate(db, user_id)
+        else:
+            LeaveBalanceService.invalidate_all(db)
+
+        return created
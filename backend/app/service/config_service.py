@@ -0,0 +1,130 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.configuration import Configuration, ConfigurationVersion
+from backend.app.config import CONFIG_CACHE_TTL_SECONDS
+
+
+class ConfigService:
+    """
+    Process-wide cache of the configuration table.
+
+    All values are loaded in one query and kept in memory. After
+    CONFIG_CACHE_TTL_SECONDS a single version lookup decides whether
+    the values need reloading, so other workers pick up changes quickly.
+    """
+
+    _values: dict = {}
+    _version = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    # ================= LOAD =================
+    @classmethod
+    def _refresh(cls, db: Session):
+
+        # Query without holding the lock: under AsyncSession.run_sync the DB
+        # call yields to the event loop, and a second request blocking on the
+        # lock there would deadlock the worker
+        version = db.query(ConfigurationVersion.version).filter(
+            ConfigurationVersion.id == 1
+        ).scalar() or 0
+
+        rows = None
+
+        if version != cls._version:
+            rows = db.query(
+                Configuration.config_parameter,
+                Configuration.config_value
+            ).all()
+
+        with cls._lock:
+
+            if rows is not None:
+                cls._values = dict(rows)
+                cls._version = version
+
+            cls._checked_at = time.monotonic()
+
+    @classmethod
+    def _values_for(cls, db: Session | None) -> dict:
+
+        if cls._version is not None and \
+                time.monotonic() - cls._checked_at < CONFIG_CACHE_TTL_SECONDS:
+            return cls._values
+
+        if db is not None:
+            cls._refresh(db)
+            return cls._values
+
+        db = SessionLocal()
+        try:
+            cls._refresh(db)
+        finally:
+            db.close()
+
+        return cls._values
+
+    # ================= ACCESSORS =================
+    @classmethod
+    def get(cls, key: str, default: str | None = None, db: Session | None = None):
+        return cls._values_for(db).get(key, default)
+
+    @classmethod
+    def get_int(cls, key: str, default: int | None = None, db: Session | None = None):
+        value = cls.get(key, db=db)
+
+        try:
+            return int(value) if value not in (None, "") else default
+        except ValueError:
+            return default
+
+    @classmethod
+    def get_float(cls, key: str, default: float | None = None, db: Session | None = None):
+        value = cls.get(key, db=db)
+
+        try:
+            return float(value) if value not in (None, "") else default
+        except ValueError:
+            return default
+
+    @classmethod
+    def get_bool(cls, key: str, default: bool = False, db: Session | None = None):
+        value = cls.get(key, db=db)
+
+        if value is None:
+            return default
+
+        return value.strip().lower() in ("true", "1", "yes", "y", "on")
+
+    # ================= INVALIDATE =================
+    @classmethod
+    def invalidate(cls, db: Session):
+        """
+        Bump the shared version inside the caller's transaction.
+
+        The local cache is dropped once that transaction commits; other
+        workers notice the new version on their next TTL check.
+        """
+
+        stmt = insert(ConfigurationVersion).values(id=1, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConfigurationVersion.id],
+            set_={"version": ConfigurationVersion.version + 1}
+        )
+
+        db.execute(stmt)
+
+        event.listen(db, "after_commit", lambda session: cls.clear(), once=True)
+
+    @classmethod
+    def clear(cls):
+
+        with cls._lock:
+            cls._values = {}
+            cls._version = None
+            cls._checked_at = 0.0
@@ -0,0 +1,231 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, select, text, cast, DateTime
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.user import User
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.leave_logs import LeaveLog
+from backend.app.models.notification_digest import NotificationDigest
+from backend.app.service.notification_service import NotificationService
+from backend.app.config import (
+    DIGEST_WINDOW_MINUTES,
+    DIGEST_POLL_SECONDS,
+    DIGEST_MAX_LOOKBACK_HOURS
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Only one process builds a digest round at a time
+DIGEST_LOCK_ID = 7413022
+
+
+class DigestService:
+
+    # ================= COLLECT =================
+    @staticmethod
+    def _collect(db: Session, now, since):
+        """
+        Return {user_id: recipient dict} of undigested activity per recipient
+        """
+
+        recipients = {}
+
+        def recipient(user_id, email, name):
+            if user_id not in recipients:
+                recipients[user_id] = {
+                    "email": email,
+                    "name": name,
+                    "oldest": None,
+                    "applications": [],
+                    "decisions": []
+                }
+            return recipients[user_id]
+
+        Manager = aliased(User)
+        Employee = aliased(User)
+
+        # New applications, for the applicant's manager
+        applications = db.query(
+            Manager.id,
+            Manager.email,
+            Manager.name,
+            Employee.name.label("employee_name"),
+            LeaveRequest.leave_type,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.number_of_days,
+            LeaveRequest.created_at.label("at")
+        ).join(
+            Employee, Employee.manager_id == Manager.id
+        ).join(
+            LeaveRequest, LeaveRequest.user_id == Employee.id
+        ).outerjoin(
+            NotificationDigest, NotificationDigest.user_id == Manager.id
+        ).filter(
+            Manager.is_active.is_(True),
+            Manager.immediate_notifications.is_(False),
+            LeaveRequest.created_at > func.greatest(NotificationDigest.last_sent_at, since),
+            LeaveRequest.created_at <= now
+        ).order_by(LeaveRequest.created_at)
+
+        for row in applications:
+            entry = recipient(row.id, row.email, row.name)
+            entry["oldest"] = entry["oldest"] or row.at
+            entry["applications"].append({
+                "employee_name": row.employee_name,
+                "leave_type": row.leave_type,
+                "start_date": row.start_date,
+                "end_date": row.end_date,
+                "number_of_days": row.number_of_days
+            })
+
+        # Decisions and other actions, for the leave owner
+        logged_at = cast(LeaveLog.timestamp, DateTime(timezone=True))
+
+        decisions = db.query(
+            Employee.id,
+            Employee.email,
+            Employee.name,
+            LeaveRequest.leave_type,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveLog.action,
+            logged_at.label("at")
+        ).join(
+            LeaveRequest, LeaveRequest.id == LeaveLog.leave_id
+        ).join(
+            Employee, Employee.id == LeaveRequest.user_id
+        ).outerjoin(
+            NotificationDigest, NotificationDigest.user_id == Employee.id
+        ).filter(
+            Employee.is_active.is_(True),
+            Employee.immediate_notifications.is_(False),
+            LeaveLog.performed_by != Employee.id,
+            logged_at > func.greatest(NotificationDigest.last_sent_at, since),
+            logged_at <= now
+        ).order_by(LeaveLog.timestamp)
+
+        for row in decisions:
+            entry = recipient(row.id, row.email, row.name)
+            entry["oldest"] = min(entry["oldest"], row.at) if entry["oldest"] else row.at
+            entry["decisions"].append({
+                "leave_type": row.leave_type,
+                "start_date": row.start_date,
+                "end_date": row.end_date,
+                "action": row.action
+            })
+
+        return recipients
+
+    # ================= SEND DUE DIGESTS =================
+    @staticmethod
+    def send_due(db: Session) -> int:
+        """
+        Queue one digest per recipient whose oldest undigested event is at
+        least a window old. Returns the number of digests queued.
+        """
+
+        locked = db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:id)"),
+            {"id": DIGEST_LOCK_ID}
+        ).scalar()
+
+        if not locked:
+            return 0
+
+        now = db.execute(select(func.now())).scalar()
+        since = now - timedelta(hours=DIGEST_MAX_LOOKBACK_HOURS)
+        due_before = now - timedelta(minutes=DIGEST_WINDOW_MINUTES)
+
+        due = {
+            user_id: entry
+            for user_id, entry in DigestService._collect(db, now, since).items()
+            if entry["oldest"] <= due_before
+        }
+
+        if not due:
+            db.commit()
+            return 0
+
+        NotificationService.notify_many(db, "digest", [
+            (
+                entry["email"],
+                {
+                    "name": entry["name"],
+                    "applications": entry["applications"],
+                    "decisions": entry["decisions"]
+                }
+            )
+            for entry in due.values()
+        ])
+
+        stmt = insert(NotificationDigest).values([
+            {"user_id": user_id, "last_sent_at": now}
+            for user_id in due
+        ])
+
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[NotificationDigest.user_id],
+            set_={"last_sent_at": stmt.excluded.last_sent_at}
+        ))
+
+        db.commit()
+
+        return len(due)
+
+
+# ================= SCHEDULER =================
+class DigestScheduler:
+    """
+    Checks for due digests every DIGEST_POLL_SECONDS in a background thread
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+
+        db = SessionLocal()
+
+        try:
+            return DigestService.send_due(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run_forever(self):
+
+        while not self._stop.is_set():
+
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Digest scheduler error")
+
+            self._stop.wait(DIGEST_POLL_SECONDS)
+
+    def start(self):
+
+        self._thread = threading.Thread(
+            target=self.run_forever,
+            name="digest-scheduler",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join(timeout=5)
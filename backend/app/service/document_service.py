@@ -0,0 +1,129 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app.models.document import Document
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.service.thumbnail_service import ThumbnailService
+from backend.app.storage import StoredUpload, get_storage, is_content_key, save_file
+from backend.app.config import DOCUMENT_GC_GRACE_HOURS
+
+
+class DocumentService:
+
+    # ================= REGISTER =================
+    @staticmethod
+    def register(db: Session, stored: StoredUpload) -> int:
+        """
+        Return the document id for stored content, creating the row once
+        """
+
+        # FOR KEY SHARE keeps collect_garbage (FOR UPDATE SKIP LOCKED) off a
+        # reused row until the leave referencing it commits. If GC deleted
+        # the row between our insert and the lock, insert it again.
+        while True:
+            db.execute(
+                insert(Document).values(
+                    sha256=stored.sha256,
+                    storage_key=stored.key,
+                    size=stored.size,
+                    content_type=stored.content_type,
+                    filename=stored.filename
+                ).on_conflict_do_nothing(index_elements=[Document.sha256])
+            )
+
+            document_id = db.query(Document.id).filter(
+                Document.sha256 == stored.sha256
+            ).with_for_update(read=True, key_share=True).scalar()
+
+            if document_id is not None:
+                return document_id
+
+    # ================= IMPORT LEGACY UPLOADS =================
+    @staticmethod
+    def import_legacy_uploads(db: Session) -> tuple[int, int]:
+        """
+        Move proofs stored as uploads/<uuid>_<name> paths into the document
+        store. Returns (imported, missing).
+        """
+
+        storage = get_storage()
+        imported = missing = 0
+
+        leaves = db.query(LeaveRequest).filter(
+            LeaveRequest.proof_document.isnot(None),
+            LeaveRequest.document_id.is_(None)
+        ).order_by(LeaveRequest.id).all()
+
+        for leave in leaves:
+
+            if not os.path.isfile(leave.proof_document):
+                missing += 1
+                continue
+
+            stored = save_file(storage, leave.proof_document)
+
+            leave.document_id = DocumentService.register(db, stored)
+            leave.proof_document = stored.key
+            imported += 1
+
+        db.commit()
+
+        return imported, missing
+
+    # ================= GARBAGE COLLECTION =================
+    @staticmethod
+    def collect_garbage(
+        db: Session,
+        grace_hours: float = DOCUMENT_GC_GRACE_HOURS
+    ) -> tuple[int, int]:
+        """
+        Remove documents no leave refers to and blobs with no document row
+        (e.g. uploads whose leave insert was rolled back). Anything touched
+        within the grace period is kept. Returns (rows, blobs) deleted.
+        """
+
+        storage = get_storage()
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+
+        # Rows an in-flight apply is referencing are locked; skip them
+        candidates = db.query(Document.id).filter(
+            Document.created_at < cutoff,
+            ~exists().where(LeaveRequest.document_id == Document.id)
+        ).with_for_update(skip_locked=True).subquery()
+
+        rows = db.execute(
+            delete(Document)
+            .where(Document.id.in_(select(candidates.c.id)))
+            .returning(Document.id)
+        ).all()
+
+        db.commit()
+
+        referenced = {key for (key,) in db.query(Document.storage_key)}
+        cutoff_ts = time.time() - grace_hours * 3600
+        blobs = 0
+
+        for key, modified in storage.list_keys():
+
+            if not is_content_key(key) or key in referenced or modified > cutoff_ts:
+                continue
+
+            storage.delete(key)
+            ThumbnailService.purge(key.split("/", 1)[1])
+            blobs += 1
+
+        # Temp files left behind by interrupted uploads
+        staging = storage.staging_dir()
+
+        if staging:
+            for name in os.listdir(staging):
+                path = os.path.join(staging, name)
+
+                if os.path.getmtime(path) < cutoff_ts:
+                    os.remove(path)
+
+        return len(rows), blobs
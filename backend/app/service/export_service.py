@@ -0,0 +1,126 @@
+import csv
+import io
+import zlib
+from fastapi import HTTPException
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.service.leave_query_service import LeaveQueryService
+
+
+# Rows fetched per round trip and written per CSV chunk
+EXPORT_BATCH_SIZE = 2000
+
+
+# column key -> (CSV header, model column)
+EXPORT_COLUMNS = {
+    "id": ("Leave ID", LeaveRequest.id),
+    "user_id": ("Employee ID", LeaveRequest.user_id),
+    "leave_type": ("Leave Type", LeaveRequest.leave_type),
+    "start_date": ("Start Date", LeaveRequest.start_date),
+    "end_date": ("End Date", LeaveRequest.end_date),
+    "number_of_days": ("Number of Days", LeaveRequest.number_of_days),
+    "status": ("Status", LeaveRequest.status),
+    "reason": ("Reason", LeaveRequest.reason),
+    "remarks": ("Remarks", LeaveRequest.remarks),
+    "approved_by_role": ("Approved By Role", LeaveRequest.approved_by_role),
+    "approved_on": ("Approved On", LeaveRequest.approved_on),
+    "created_at": ("Applied On", LeaveRequest.created_at),
+}
+
+
+class ExportService:
+
+    # ================= RESOLVE COLUMNS =================
+    @staticmethod
+    def resolve_columns(columns: str | None, default: list[str]) -> list[str]:
+        """
+        Parse a comma separated column list, falling back to the default set
+        """
+
+        if not columns:
+            return default
+
+        keys = [c.strip() for c in columns.split(",") if c.strip()]
+
+        unknown = [k for k in keys if k not in EXPORT_COLUMNS]
+
+        if unknown or not keys:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown export columns: {', '.join(unknown)}. "
+                       f"Allowed: {', '.join(EXPORT_COLUMNS)}"
+            )
+
+        return keys
+
+    # ================= STREAM CSV =================
+    @staticmethod
+    def stream_csv(
+        columns: list[str],
+        headers: list[str] | None = None,
+        compress: bool = False,
+        **filters
+    ):
+        """
+        Yield CSV (optionally gzip) chunks as rows arrive from a server-side cursor
+        """
+
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(text: str):
+            data = text.encode("utf-8")
+            return compressor.compress(data) if compressor else data
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(headers or [EXPORT_COLUMNS[c][0] for c in columns])
+
+        db = SessionLocal()
+
+        try:
+            query = LeaveQueryService.apply_filters(
+                db.query(*[EXPORT_COLUMNS[c][1] for c in columns]), **filters
+            )
+
+            query = query.order_by(LeaveRequest.id).yield_per(EXPORT_BATCH_SIZE)
+
+            rows_in_buffer = 0
+
+            for row in query:
+                writer.writerow(row)
+                rows_in_buffer += 1
+
+                if rows_in_buffer >= EXPORT_BATCH_SIZE:
+                    chunk = encode(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate(0)
+                    rows_in_buffer = 0
+
+                    if chunk:
+                        yield chunk
+
+            chunk = encode(buffer.getvalue())
+
+            if compressor:
+                chunk += compressor.flush()
+
+            if chunk:
+                yield chunk
+
+        finally:
+            db.close()
+
+    # ================= RESPONSE HEADERS =================
+    @staticmethod
+    def response_meta(filename: str, compress: bool):
+
+        if compress:
+            return "application/gzip", {
+                "Content-Disposition": f"attachment; filename={filename}.gz"
+            }
+
+        return "text/csv", {
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+from sqlalchemy.orm import Session
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.holidays import Holiday
+from backend.app.config import HOLIDAY_CACHE_TTL_SECONDS
+
+
+class HolidayCalendar:
+    """
+    In-process holiday calendar with per-year cumulative working-day arrays.
+
+    For a year, cumulative[n] is the number of working days (Mon-Fri, not a
+    holiday) from January 1st up to and including day-of-year n, with
+    cumulative[0] == 0. Counting working days in any range is then two array
+    lookups per calendar year touched.
+    """
+
+    _holidays: frozenset = frozenset()
+    _cumulative: dict = {}
+    _loaded_at = None
+    _lock = threading.Lock()
+
+    # ================= LOAD =================
+    @classmethod
+    def _ensure_loaded(cls, db: Session | None):
+
+        if cls._loaded_at is not None and \
+                time.monotonic() - cls._loaded_at < HOLIDAY_CACHE_TTL_SECONDS:
+            return
+
+        # Loaded outside the lock; see ConfigService._refresh
+        own_session = db is None
+        db = db or SessionLocal()
+
+        try:
+            rows = db.query(Holiday.date).all()
+        finally:
+            if own_session:
+                db.close()
+
+        with cls._lock:
+            cls._holidays = frozenset(row.date for row in rows)
+            cls._cumulative = {}
+            cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def invalidate(cls):
+        # Next lookup reloads the holiday table
+        with cls._lock:
+            cls._loaded_at = None
+            cls._cumulative = {}
+
+    # ================= YEAR ARRAYS =================
+    @classmethod
+    def _snapshot(cls) -> tuple[frozenset, dict]:
+        # Holidays and the arrays built from them, read together so a reload
+        # can never pair one generation's holidays with the other's arrays
+        with cls._lock:
+            return cls._holidays, cls._cumulative
+
+    @staticmethod
+    def _year(holidays: frozenset, cumulative_by_year: dict, year: int) -> list:
+
+        cumulative = cumulative_by_year.get(year)
+
+        if cumulative is None:
+            first = date(year, 1, 1)
+            days = (date(year + 1, 1, 1) - first).days
+
+            flags = (
+                1 if d.weekday() < 5 and d not in holidays else 0
+                for d in (first + timedelta(days=i) for i in range(days))
+            )
+
+            cumulative = [0, *accumulate(flags)]
+
+            # Stored in the snapshot's own dict; a reload replaces that dict,
+            # so arrays built from old holidays are dropped with it
+            cumulative_by_year[year] = cumulative
+
+        return cumulative
+
+    @classmethod
+    def _count(cls, start_date: date, end_date: date, snapshot=None) -> int:
+
+        if end_date < start_date:
+            return 0
+
+        holidays, cumulative_by_year = snapshot or cls._snapshot()
+        total = 0
+
+        for year in range(start_date.year, end_date.year + 1):
+            cumulative = cls._year(holidays, cumulative_by_year, year)
+
+            first = start_date.timetuple().tm_yday if year == start_date.year else 1
+            last = end_date.timetuple().tm_yday if year == end_date.year else len(cumulative) - 1
+
+            total += cumulative[last] - cumulative[first - 1]
+
+        return total
+
+    # ================= PUBLIC API =================
+    @classmethod
+    def working_days(cls, start_date: date, end_date: date, db: Session | None = None) -> int:
+        cls._ensure_loaded(db)
+        return cls._count(start_date, end_date)
+
+    @classmethod
+    def working_days_many(cls, ranges, db: Session | None = None) -> list:
+        """
+        Count working days for many (start_date, end_date) pairs with one load
+        """
+
+        cls._ensure_loaded(db)
+        snapshot = cls._snapshot()
+
+        return [cls._count(start, end, snapshot) for start, end in ranges]
+
+    @classmethod
+    def is_holiday(cls, day: date, db: Session | None = None) -> bool:
+        cls._ensure_loaded(db)
+        holidays, _ = cls._snapshot()
+
+        return day in holidays
@@ -0,0 +1,76 @@
+import csv
+import io
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app.models.holidays import Holiday
+
+
+class HolidayService:
+
+    # ================= PARSE CSV =================
+    @staticmethod
+    def parse_csv(content: bytes) -> list[dict]:
+        """
+        Parse a CSV with date,name columns (holiday_date,holiday_name also accepted)
+        """
+
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+        reader = csv.DictReader(io.StringIO(text))
+        rows = []
+
+        for line, record in enumerate(reader, start=2):
+            record = {
+                (k or "").strip().lower(): (v or "").strip()
+                for k, v in record.items()
+            }
+
+            raw_date = record.get("date") or record.get("holiday_date")
+            name = record.get("name") or record.get("holiday_name")
+
+            if not raw_date or not name:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Line {line}: date and name are required"
+                )
+
+            try:
+                holiday_date = date.fromisoformat(raw_date)
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Line {line}: invalid date '{raw_date}', expected YYYY-MM-DD"
+                )
+
+            rows.append({"date": holiday_date, "name": name})
+
+        return rows
+
+    # ================= BULK UPSERT =================
+    @staticmethod
+    def bulk_upsert(db: Session, rows: list[dict]) -> int:
+        """
+        Insert or rename holidays in a single multi-row statement (caller commits)
+        """
+
+        # One row per date; calendars from several regions may repeat a date
+        by_date = {row["date"]: row for row in rows}
+
+        if not by_date:
+            return 0
+
+        stmt = insert(Holiday).values(list(by_date.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Holiday.date],
+            set_={"name": stmt.excluded.name}
+        )
+
+        db.execute(stmt)
+
+        return len(by_date)
@@ -1,7 +1,49 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import array_agg, aggregate_order_by, insert
 
 from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.leave_balance import LeaveBalance, LeaveBalanceVersion
+from backend.app.models.user import User
+from backend.app.utils.cache import TTLCache
+from backend.app.config import BALANCE_CACHE_TTL_SECONDS, BALANCE_CACHE_MAX_SIZE
+
+
+# user_id -> ((user version, epoch), {year: balance summary})
+balance_cache = TTLCache(maxsize=BALANCE_CACHE_MAX_SIZE, ttl=BALANCE_CACHE_TTL_SECONDS)
+
+# LeaveBalanceVersion row bumped by changes that affect every user
+EPOCH_USER_ID = 0
+
+
+# Days granted per quarter unless overridden by "<type>_quarterly_allowance"
+DEFAULT_QUARTERLY_ALLOWANCES = {
+    "CASUAL": 6,
+    "SICK": 6,
+    "EARNED": 12,
+    "LOSS_OF_PAY": 0,
+    "PATERNITY": 15,
+    "MATERNITY": 180,
+    "PERIODS": 12
+}
+
+# Leave types restricted to one gender
+LEAVE_TYPE_GENDERS = {
+    "PATERNITY": "MALE",
+    "MATERNITY": "FEMALE",
+    "PERIODS": "FEMALE"
+}
+
+
+def leave_types_for(gender: str | None) -> list[str]:
+
+    gender = (gender or "").upper()
+
+    return [
+        leave_type
+        for leave_type in DEFAULT_QUARTERLY_ALLOWANCES
+        if LEAVE_TYPE_GENDERS.get(leave_type, gender) == gender
+    ]
 
 
 class LeaveBalanceService:
@@ -18,7 +60,177 @@ class LeaveBalanceService:
         ).filter(
             LeaveRequest.user_id == user_id,
             LeaveRequest.leave_type == leave_type,
-            LeaveRequest.status == "APPROVED"
+            LeaveRequest.status == "Approved"
         ).scalar()
 
         return total
+
+    # ================= BALANCE SUMMARY =================
+    @staticmethod
+    def get_balance_summary(
+        db: Session,
+        user_id: int,
+        gender: str | None,
+        year: int
+    ) -> list[dict]:
+        """
+        Per-type yearly totals with a per-quarter breakdown, from one query
+        """
+
+        # Read before the summary: an invalidation committed after this point
+        # bumps the version, so the entry stored below is never served again
+        versions = LeaveBalanceService._versions(db, user_id)
+
+        cached_versions, cached = balance_cache.get(user_id) or (None, {})
+
+        if cached_versions != versions:
+            cached = {}
+
+        if year in cached:
+            return cached[year]
+
+        rows = db.query(
+            LeaveBalance.leave_type,
+            LeaveBalance.quarter,
+            LeaveBalance.leaves_taken,
+            LeaveBalance.remaining_leaves
+        ).filter(
+            LeaveBalance.user_id == user_id,
+            LeaveBalance.year == year
+        ).order_by(LeaveBalance.quarter).all()
+
+        summary = {
+            leave_type: {
+                "leave_type": leave_type,
+                "leaves_taken": 0.0,
+                "remaining_leaves": 0.0,
+                "quarters": []
+            }
+            for leave_type in leave_types_for(gender)
+        }
+
+        for row in rows:
+
+            entry = summary.get(row.leave_type)
+
+            if entry is None:
+                continue
+
+            taken = float(row.leaves_taken or 0)
+            remaining = float(row.remaining_leaves or 0)
+
+            entry["leaves_taken"] += taken
+
+            # Carry-forward folds each quarter's leftover into the next, so
+            # what is left for the year is the latest quarter's remaining
+            entry["remaining_leaves"] = remaining
+            entry["quarters"].append({
+                "quarter": row.quarter,
+                "leaves_taken": taken,
+                "remaining_leaves": remaining
+            })
+
+        result = list(summary.values())
+
+        balance_cache.set(user_id, (versions, {**cached, year: result}))
+
+        return result
+
+    # ================= TEAM SUMMARY =================
+    @staticmethod
+    def get_team_summary(db: Session, manager_id: int, year: int) -> list[dict]:
+        """
+        Yearly totals per type for every member of a manager's team, from one
+        aggregate query
+        """
+
+        rows = db.query(
+            User.id,
+            User.name,
+            LeaveBalance.leave_type,
+            func.sum(LeaveBalance.leaves_taken).label("leaves_taken"),
+            # Latest quarter only; see get_balance_summary
+            array_agg(
+                aggregate_order_by(LeaveBalance.remaining_leaves, LeaveBalance.quarter.desc())
+            )[1].label("remaining_leaves")
+        ).join(
+            LeaveBalance, LeaveBalance.user_id == User.id
+        ).filter(
+            User.manager_id == manager_id,
+            LeaveBalance.year == year
+        ).group_by(
+            User.id, User.name, LeaveBalance.leave_type
+        ).order_by(
+            User.name, User.id, LeaveBalance.leave_type
+        ).all()
+
+        team = {}
+
+        for row in rows:
+
+            member = team.setdefault(row.id, {
+                "user_id": row.id,
+                "employee_name": row.name,
+                "balances": []
+            })
+
+            member["balances"].append({
+                "leave_type": row.leave_type,
+                "leaves_taken": float(row.leaves_taken or 0),
+                "remaining_leaves": float(row.remaining_leaves or 0)
+            })
+
+        return list(team.values())
+
+    # ================= INVALIDATE =================
+    @staticmethod
+    def _versions(db: Session, user_id: int) -> tuple:
+        """
+        (user version, epoch) as committed; one primary-key lookup
+        """
+
+        rows = dict(db.query(
+            LeaveBalanceVersion.user_id,
+            LeaveBalanceVersion.version
+        ).filter(
+            LeaveBalanceVersion.user_id.in_([user_id, EPOCH_USER_ID])
+        ).all())
+
+        return rows.get(user_id, 0), rows.get(EPOCH_USER_ID, 0)
+
+    @staticmethod
+    def _bump(db: Session, user_ids):
+
+        # Sorted so concurrent transactions lock rows in the same order. The
+        # row lock is per user, and the caller already holds that user's
+        # balance rows, so this adds no cross-user contention.
+        stmt = insert(LeaveBalanceVersion).values([
+            {"user_id": user_id, "version": 1} for user_id in sorted(set(user_ids))
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LeaveBalanceVersion.user_id],
+            set_={"version": LeaveBalanceVersion.version + 1}
+        )
+
+        # AsyncSession callers pass through run_sync, so this is a sync session
+        getattr(db, "sync_session", db).execute(stmt)
+
+    @staticmethod
+    def invalidate(db: Session | None, *user_ids: int):
+        """
+        Bump the users' versions in the caller's transaction; every worker
+        sees the change on its next read once it commits
+        """
+
+        if db is None:
+            for user_id in user_ids:
+                balance_cache.pop(user_id)
+            return
+
+        if user_ids:
+            LeaveBalanceService._bump(db, user_ids)
+
+    @staticmethod
+    def invalidate_all(db: Session):
+
+        LeaveBalanceService._bump(db, [EPOCH_USER_ID])
@@ -0,0 +1,174 @@
+import json
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.user import User
+
+
+# Rows fetched per round trip while streaming
+STREAM_BATCH_SIZE = 1000
+
+
+class LeaveQueryService:
+
+    # Only the columns the admin list actually returns
+    LIST_COLUMNS = (
+        LeaveRequest.id,
+        LeaveRequest.user_id,
+        LeaveRequest.leave_type,
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.status,
+        LeaveRequest.reason,
+        LeaveRequest.number_of_days,
+        LeaveRequest.remarks,
+        LeaveRequest.approved_by_role,
+        LeaveRequest.approved_on,
+        LeaveRequest.proof_document,
+        LeaveRequest.document_id,
+    )
+
+    # ================= FILTERS =================
+    @staticmethod
+    def apply_filters(
+        query,
+        status: str | None = None,
+        user_id: int | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        month: int | None = None,
+        leave_type: str | None = None
+    ):
+
+        # Stored as "Pending" / "Approved" / ...; equality keeps the index usable
+        if status is not None:
+            query = query.filter(LeaveRequest.status == status.capitalize())
+
+        if user_id is not None:
+            query = query.filter(LeaveRequest.user_id == user_id)
+
+        # Leaves overlapping the requested window
+        if from_date is not None:
+            query = query.filter(LeaveRequest.end_date >= from_date)
+
+        if to_date is not None:
+            query = query.filter(LeaveRequest.start_date <= to_date)
+
+        if month is not None:
+            query = query.filter(
+                func.extract("month", LeaveRequest.start_date) == month
+            )
+
+        if leave_type is not None:
+            query = query.filter(
+                func.lower(LeaveRequest.leave_type) == leave_type.lower()
+            )
+
+        return query
+
+    # ================= KEYSET PAGE =================
+    @staticmethod
+    def list_page(
+        db: Session,
+        limit: int,
+        cursor: int | None = None,
+        **filters
+    ):
+        """
+        Return one page of leaves (newest first) and the cursor for the next page
+        """
+
+        query = LeaveQueryService.apply_filters(
+            db.query(*LeaveQueryService.LIST_COLUMNS), **filters
+        )
+
+        if cursor is not None:
+            query = query.filter(LeaveRequest.id < cursor)
+
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(LeaveRequest.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].id
+
+        return [dict(row._mapping) for row in rows], next_cursor
+
+    # ================= TEAM PAGE =================
+    @staticmethod
+    def team_page(
+        db: Session,
+        manager_id: int,
+        limit: int,
+        cursor: int | None = None,
+        **filters
+    ):
+        """
+        One page of the manager's team leaves (newest first) with the employee
+        name joined in, plus the cursor for the next page
+        """
+
+        query = LeaveQueryService.apply_filters(
+            db.query(
+                *LeaveQueryService.LIST_COLUMNS,
+                User.name.label("employee_name")
+            ).join(User, LeaveRequest.user_id == User.id).filter(
+                User.manager_id == manager_id
+            ),
+            **filters
+        )
+
+        if cursor is not None:
+            query = query.filter(LeaveRequest.id < cursor)
+
+        rows = query.order_by(LeaveRequest.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1].id
+
+        return [dict(row._mapping) for row in rows], next_cursor
+
+    # ================= NDJSON STREAM =================
+    @staticmethod
+    def stream_ndjson(cursor: int | None = None, **filters):
+        """
+        Yield matching leaves as NDJSON chunks using a server-side cursor.
+
+        Uses its own session so the stream does not depend on the request
+        session still being open while the response body is sent.
+        """
+
+        db = SessionLocal()
+
+        try:
+            query = LeaveQueryService.apply_filters(
+                db.query(*LeaveQueryService.LIST_COLUMNS), **filters
+            )
+
+            if cursor is not None:
+                query = query.filter(LeaveRequest.id < cursor)
+
+            query = query.order_by(LeaveRequest.id.desc()).yield_per(STREAM_BATCH_SIZE)
+
+            chunk = []
+
+            for row in query:
+                chunk.append(json.dumps(dict(row._mapping), default=str))
+
+                if len(chunk) >= STREAM_BATCH_SIZE:
+                    yield "\n".join(chunk) + "\n"
+                    chunk = []
+
+            if chunk:
+                yield "\n".join(chunk) + "\n"
+
+        finally:
+            db.close()
@@ -1,11 +1,16 @@
-from datetime import date, timedelta
+from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from backend.app.models.leave_balance import LeaveBalance
 from backend.app.models.leave_request import LeaveRequest
-from backend.app.models.configuration import Configuration
-from backend.app.models.holidays import Holiday
+from backend.app.service.config_service import ConfigService
+from backend.app.service.holiday_calendar import HolidayCalendar
+from backend.app.service.leave_stats_service import LeaveStatsService
+from backend.app.service.leave_validation_service import is_overlap_violation, OVERLAP_DETAIL
 
 
 class LeaveService:
@@ -20,45 +25,33 @@ class LeaveService:
         if end_date < start_date:
             raise ValueError("End date cannot be before start date")
 
-        total_days = 0
-        current_date = start_date
-
-        # Fetch holidays in date range
-        holidays = db.query(Holiday).filter(
-            Holiday.date >= start_date,
-            Holiday.date <= end_date
-        ).all()
-
-        holiday_dates = {holiday.date for holiday in holidays}
-
-        while current_date <= end_date:
-            # Monday=0, Sunday=6
-            if current_date.weekday() < 5:  # Skip Saturday(5) & Sunday(6)
-                if current_date not in holiday_dates:
-                    total_days += 1
-
-            current_date += timedelta(days=1)
-
-        return total_days
+        return HolidayCalendar.working_days(start_date, end_date, db=db)
 
 
     # ================= GET CONFIG VALUE =================
     @staticmethod
     def get_config_value(db: Session, key: str):
-        config = db.query(Configuration).filter(
-            Configuration.config_parameter == key
-        ).first()
+        return ConfigService.get(key, db=db)
 
-        if not config:
-            return None
 
-        return config.config_value
+    # ================= LEAVE RULES =================
+    @staticmethod
+    def get_leave_rules(db: Session):
+        """
+        (maximum_consecutive_leave, proof_required, proof_required_after_days)
+        """
+
+        return (
+            ConfigService.get_int("maximum_consecutive_leave", db=db),
+            ConfigService.get_bool("proof_required", db=db),
+            ConfigService.get_int("proof_required_after_days", db=db)
+        )
 
 
     # ================= APPLY LEAVE =================
     @staticmethod
     async def apply_leave(
-        db: Session,
+        db: AsyncSession,
         user_id: int,
         leave_type: str,
         start_date: date,
@@ -67,8 +60,9 @@ class LeaveService:
         proof_document: str | None = None
     ) -> LeaveRequest:
 
-        number_of_days = LeaveService.calculate_leave_days(
-            db, start_date, end_date
+        # Holiday calendar and config reloads run on the async connection
+        number_of_days = await db.run_sync(
+            LeaveService.calculate_leave_days, start_date, end_date
         )
 
         if number_of_days <= 0:
@@ -79,13 +73,13 @@ class LeaveService:
 
         # ================= CONFIG VALIDATIONS =================
 
-        # 1️⃣ Maximum consecutive leave
-        max_consecutive = LeaveService.get_config_value(
-            db, "maximum_consecutive_leave"
+        max_consecutive, proof_required, proof_after_days = await db.run_sync(
+            LeaveService.get_leave_rules
         )
 
+        # 1️⃣ Maximum consecutive leave
+
         if max_consecutive:
-            max_consecutive = int(max_consecutive)
             if number_of_days > max_consecutive:
                 raise HTTPException(
                     status_code=400,
@@ -93,14 +87,8 @@ class LeaveService:
                 )
 
         # 2️⃣ Proof required
-        proof_required = LeaveService.get_config_value(db, "proof_required")
-        proof_after_days = LeaveService.get_config_value(
-            db, "proof_required_after_days"
-        )
-
-        if proof_required and proof_required.lower() == "true":
+        if proof_required:
             if proof_after_days:
-                proof_after_days = int(proof_after_days)
 
                 if number_of_days > proof_after_days and not proof_document:
                     raise HTTPException(
@@ -110,10 +98,12 @@ class LeaveService:
 
         # ================= BALANCE CHECK =================
 
-        leave_balance = db.query(LeaveBalance).filter(
-            LeaveBalance.user_id == user_id,
-            LeaveBalance.leave_type == leave_type
-        ).first()
+        leave_balance = (await db.execute(
+            select(LeaveBalance).where(
+                LeaveBalance.user_id == user_id,
+                LeaveBalance.leave_type == leave_type
+            ).limit(1)
+        )).scalar_one_or_none()
 
         if not leave_balance:
             raise HTTPException(
@@ -135,12 +125,24 @@ class LeaveService:
             start_date=start_date,
             end_date=end_date,
             number_of_days=number_of_days,
-            status="PENDING",
+            status="Pending",
             reason=reason
         )
 
         db.add(leave)
-        db.commit()
-        db.refresh(leave)
+
+        try:
+            await db.flush()
+        except IntegrityError as e:
+            await db.rollback()
+
+            if is_overlap_violation(e):
+                raise HTTPException(status_code=400, detail=OVERLAP_DETAIL)
+
+            raise
+
+        await db.run_sync(LeaveStatsService.record_transition, leave, None, leave.status)
+        await db.commit()
+        await db.refresh(leave)
 
         return leave
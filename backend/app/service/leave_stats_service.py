@@ -0,0 +1,211 @@
+from collections import Counter
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.leave_status_count import LeaveStatusCount
+from backend.app.models.leave_monthly_stat import LeaveMonthlyStat
+
+
+def normalize_status(status: str | None) -> str:
+    # "PENDING" / "pending" / "Pending" all count as "Pending"
+    return (status or "Pending").capitalize()
+
+
+class LeaveStatsService:
+
+    # ================= RECORD TRANSITION =================
+    @staticmethod
+    def record_transition(
+        db: Session,
+        leave: LeaveRequest,
+        old_status: str | None,
+        new_status: str | None
+    ):
+        """
+        Apply a leave status change to the rollups inside the caller's transaction.
+
+        old_status is None for a newly created leave.
+        """
+
+        LeaveStatsService.record_transitions(db, [(leave, old_status, new_status)])
+
+    @staticmethod
+    def record_transitions(db: Session, transitions):
+        """
+        Apply many (leave, old_status, new_status) changes with one upsert per
+        rollup table, whatever the batch size
+        """
+
+        status_deltas = Counter()
+        monthly_totals = Counter()
+        monthly_days = Counter()
+
+        for leave, old_status, new_status in transitions:
+
+            days = leave.number_of_days or 0
+            bucket = (leave.start_date.year, leave.start_date.month, leave.leave_type)
+
+            changes = []
+
+            if old_status is not None:
+                changes.append((old_status, -1))
+
+            if new_status is not None:
+                changes.append((new_status, 1))
+
+            for status, delta in changes:
+
+                status = normalize_status(status)
+                status_deltas[status] += delta
+                monthly_totals[(*bucket, status)] += delta
+                monthly_days[(*bucket, status)] += delta * days
+
+        # Sorted so concurrent transactions lock rows in the same order
+        rows = [
+            {"status": status, "total": delta}
+            for status, delta in sorted(status_deltas.items())
+            if delta
+        ]
+
+        if rows:
+            stmt = insert(LeaveStatusCount).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LeaveStatusCount.status],
+                set_={"total": LeaveStatusCount.total + stmt.excluded.total}
+            )
+
+            db.execute(stmt)
+
+        # Same deltas per (year, month, leave_type, status) bucket
+        monthly_rows = [
+            {
+                "year": year,
+                "month": month,
+                "leave_type": leave_type,
+                "status": status,
+                "total": total,
+                "days": monthly_days[(year, month, leave_type, status)]
+            }
+            for (year, month, leave_type, status), total in sorted(monthly_totals.items())
+            if total or monthly_days[(year, month, leave_type, status)]
+        ]
+
+        if not monthly_rows:
+            return
+
+        stmt = insert(LeaveMonthlyStat).values(monthly_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                LeaveMonthlyStat.year,
+                LeaveMonthlyStat.month,
+                LeaveMonthlyStat.leave_type,
+                LeaveMonthlyStat.status
+            ],
+            set_={
+                "total": LeaveMonthlyStat.total + stmt.excluded.total,
+                "days": LeaveMonthlyStat.days + stmt.excluded.days
+            }
+        )
+
+        db.execute(stmt)
+
+    # ================= STATUS COUNTS =================
+    @staticmethod
+    def get_status_counts(db: Session) -> dict:
+
+        # Seeded by migration v0007 and kept current by record_transition
+        rows = db.query(LeaveStatusCount.status, LeaveStatusCount.total).all()
+
+        return {status: total for status, total in rows}
+
+    # ================= MONTHLY COUNTS =================
+    @staticmethod
+    def get_monthly_counts(db: Session, from_year: int, to_year: int):
+        """
+        Return (year, month, total) rows for the given year range, oldest first
+        """
+
+        # Seeded by migration v0008 and kept current by record_transition
+        rows = db.query(
+            LeaveMonthlyStat.year,
+            LeaveMonthlyStat.month,
+            func.sum(LeaveMonthlyStat.total).label("total")
+        ).filter(
+            LeaveMonthlyStat.year >= from_year,
+            LeaveMonthlyStat.year <= to_year
+        ).group_by(
+            LeaveMonthlyStat.year,
+            LeaveMonthlyStat.month
+        ).order_by(
+            LeaveMonthlyStat.year,
+            LeaveMonthlyStat.month
+        ).all()
+
+        return [(year, month, int(total)) for year, month, total in rows]
+
+    # ================= REBUILD =================
+    @staticmethod
+    def rebuild_all(db: Session):
+        """
+        Backfill every rollup from leave_requests (caller commits)
+        """
+
+        LeaveStatsService.rebuild_status_counts(db)
+        LeaveStatsService.rebuild_monthly_stats(db)
+
+    @staticmethod
+    def rebuild_monthly_stats(db: Session):
+
+        year = func.extract("year", LeaveRequest.start_date)
+        month = func.extract("month", LeaveRequest.start_date)
+        status = func.initcap(func.coalesce(LeaveRequest.status, "Pending"))
+
+        results = db.query(
+            year.label("year"),
+            month.label("month"),
+            LeaveRequest.leave_type,
+            status.label("status"),
+            func.count(LeaveRequest.id).label("total"),
+            func.coalesce(func.sum(LeaveRequest.number_of_days), 0).label("days")
+        ).group_by(year, month, LeaveRequest.leave_type, status).all()
+
+        db.query(LeaveMonthlyStat).delete()
+
+        if results:
+            db.execute(
+                insert(LeaveMonthlyStat).values([
+                    {
+                        "year": int(r.year),
+                        "month": int(r.month),
+                        "leave_type": r.leave_type,
+                        "status": r.status,
+                        "total": r.total,
+                        "days": r.days
+                    }
+                    for r in results
+                ])
+            )
+
+    @staticmethod
+    def rebuild_status_counts(db: Session):
+        """
+        Recompute the status rollup from leave_requests with one GROUP BY
+        """
+
+        status = func.initcap(func.coalesce(LeaveRequest.status, "Pending"))
+
+        results = db.query(
+            status.label("status"),
+            func.count(LeaveRequest.id)
+        ).group_by(status).all()
+
+        db.query(LeaveStatusCount).delete()
+
+        if results:
+            db.execute(
+                insert(LeaveStatusCount).values([
+                    {"status": s, "total": total} for s, total in results
+                ])
+            )
@@ -0,0 +1,230 @@
+from datetime import date
+from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, values, column, Integer, String, Date
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.models.user import User
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.leave_balance import LeaveBalance
+from backend.app.service.balance_provisioning_service import BalanceProvisioningService
+from backend.app.service.holiday_calendar import HolidayCalendar
+
+
+# SQLSTATE exclusion_violation, raised by ex_leave_requests_no_overlap
+EXCLUSION_VIOLATION = "23P01"
+
+OVERLAP_DETAIL = "Leave request overlaps with an existing leave"
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+
+class LeaveValidationService:
+
+    # ================= RULES =================
+    @staticmethod
+    def rule_errors(
+        user,
+        leave_type: str,
+        start_date: date,
+        end_date: date,
+        has_proof: bool,
+        today: date
+    ) -> list[tuple[int, str]]:
+        """
+        (status_code, detail) for every policy rule the request breaks, in
+        the order /leave/apply reports them. Needs no database access.
+        """
+
+        errors = []
+        gender = (user.gender or "").upper()
+
+        # Block leave during notice period
+        if user.resignation_status == "notice_period":
+            if user.last_working_day and today <= user.last_working_day:
+                errors.append((400, "You are in notice period. Leave cannot be applied."))
+
+        if user.resignation_status == "resigned":
+            errors.append((403, "You are no longer an active employee."))
+
+        # Gender restrictions
+        if gender == "MALE" and leave_type in ["MATERNITY", "PERIODS"]:
+            errors.append((400, "You are not eligible for this leave type."))
+
+        if gender == "FEMALE" and leave_type == "PATERNITY":
+            errors.append((400, "You are not eligible for this leave type."))
+
+        # Date validation
+        if start_date > end_date:
+            errors.append((400, "Invalid date range"))
+            return errors
+
+        leave_days = (end_date - start_date).days + 1
+
+        # Sick leave rules
+        if leave_type == "SICK":
+
+            if start_date != today:
+                errors.append((400, "Sick leave can only be applied for today."))
+
+            if leave_days > 2 and not has_proof:
+                errors.append((400, "Medical proof required for sick leave more than 2 days."))
+
+        # Maternity/Paternity proof
+        if leave_type in ["MATERNITY", "PATERNITY"] and not has_proof:
+            errors.append((400, "Proof document required."))
+
+        return errors
+
+    # ================= VALIDATE =================
+    @staticmethod
+    def validate(db: Session, candidates: list[dict]) -> list[dict]:
+        """
+        Check many candidate leaves (user_id, leave_type, start_date,
+        end_date, has_proof) without writing anything.
+
+        Users, overlaps and balances for the whole set come from one
+        range-join query. Candidates are also checked against earlier
+        candidates in the same batch, for overlap and for balance.
+        """
+
+        today = date.today()
+
+        table = values(
+            column("idx", Integer),
+            column("user_id", Integer),
+            column("leave_type", String),
+            column("start_date", Date),
+            column("end_date", Date),
+            column("year", Integer),
+            column("quarter", Integer),
+            name="candidates"
+        ).data([
+            (
+                idx,
+                c["user_id"],
+                c["leave_type"],
+                c["start_date"],
+                c["end_date"],
+                c["start_date"].year,
+                (c["start_date"].month - 1) // 3 + 1
+            )
+            for idx, c in enumerate(candidates)
+        ])
+
+        overlaps = select(LeaveRequest.id).where(
+            LeaveRequest.user_id == table.c.user_id,
+            LeaveRequest.status.in_(["Pending", "Approved"]),
+            LeaveRequest.start_date <= table.c.end_date,
+            LeaveRequest.end_date >= table.c.start_date
+        ).exists()
+
+        rows = db.execute(
+            select(
+                table.c.idx,
+                User.gender,
+                User.resignation_status,
+                User.last_working_day,
+                overlaps.label("overlaps"),
+                LeaveBalance.remaining_leaves
+            ).select_from(table).join(
+                User, User.id == table.c.user_id
+            ).outerjoin(
+                LeaveBalance,
+                and_(
+                    LeaveBalance.user_id == table.c.user_id,
+                    LeaveBalance.leave_type == table.c.leave_type,
+                    LeaveBalance.year == table.c.year,
+                    LeaveBalance.quarter == table.c.quarter
+                )
+            )
+        ).all()
+
+        found = {row.idx: row for row in rows}
+
+        # Unprovisioned quarters are created with the base allowance on apply
+        allowances = {
+            leave_type: allowance
+            for leave_type, allowance, _, _ in BalanceProvisioningService.allowance_rules(db)
+        }
+
+        # Charged days exclude weekends and holidays, as on apply
+        working_days = HolidayCalendar.working_days_many(
+            [(c["start_date"], c["end_date"]) for c in candidates], db=db
+        )
+
+        results = []
+        accepted = []
+        claimed = {}
+
+        for idx, c in enumerate(candidates):
+
+            row = found.get(idx)
+
+            if row is None:
+                results.append({
+                    "index": idx,
+                    "valid": False,
+                    "errors": ["User not found"],
+                    "leave_days": None,
+                    "remaining_leaves": None
+                })
+                continue
+
+            errors = [
+                detail for _, detail in LeaveValidationService.rule_errors(
+                    row,
+                    c["leave_type"],
+                    c["start_date"],
+                    c["end_date"],
+                    c.get("has_proof", False),
+                    today
+                )
+            ]
+
+            leave_days = working_days[idx]
+
+            if c["start_date"] <= c["end_date"] and leave_days == 0:
+                errors.append("Selected dates contain no working days")
+
+            if row.overlaps:
+                errors.append(OVERLAP_DETAIL)
+
+            if any(
+                other["user_id"] == c["user_id"] and
+                other["start_date"] <= c["end_date"] and
+                other["end_date"] >= c["start_date"]
+                for other in accepted
+            ):
+                errors.append("Leave request overlaps with another leave in this batch")
+
+            key = (c["user_id"], c["leave_type"], c["start_date"].year, (c["start_date"].month - 1) // 3 + 1)
+
+            if row.remaining_leaves is not None:
+                remaining = float(row.remaining_leaves)
+            elif c["leave_type"] in allowances:
+                remaining = float(allowances[c["leave_type"]])
+            else:
+                remaining = None
+                errors.append("Leave balance not found for this leave type")
+
+            if remaining is not None:
+                remaining -= claimed.get(key, 0)
+
+                if leave_days > remaining:
+                    errors.append("Insufficient leave balance")
+
+            if not errors:
+                accepted.append(c)
+                claimed[key] = claimed.get(key, 0) + leave_days
+
+            results.append({
+                "index": idx,
+                "valid": not errors,
+                "errors": errors,
+                "leave_days": leave_days,
+                "remaining_leaves": remaining
+            })
+
+        return results
@@ -0,0 +1,203 @@
+import logging
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+from email.mime.text import MIMEText
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from backend.database.postgres import SessionLocal
+from backend.app.models.mail_outbox import MailOutbox
+from backend.app.service.config_service import ConfigService
+from backend.app.utils.smtp_pool import SMTPConnectionPool, SMTPSettings
+from backend.app.config import (
+    MAIL_USERNAME,
+    MAIL_PASSWORD,
+    MAIL_FROM,
+    MAIL_PORT,
+    MAIL_SERVER,
+    MAIL_BATCH_SIZE,
+    MAIL_POLL_SECONDS,
+    MAIL_MAX_ATTEMPTS,
+    MAIL_RETRY_BASE_SECONDS,
+    SMTP_IDLE_SECONDS
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# ================= SMTP SETTINGS =================
+def load_smtp_settings() -> SMTPSettings:
+    # Configuration table first (same keys as before), then .env
+    username = ConfigService.get("MFA_EMAIL") or MAIL_USERNAME
+    password = ConfigService.get("MFA_EMAIL_PASSWORD") or MAIL_PASSWORD
+
+    return SMTPSettings(
+        host=ConfigService.get("SMTP_SERVER") or MAIL_SERVER or "smtp.gmail.com",
+        port=ConfigService.get_int("SMTP_PORT") or MAIL_PORT,
+        username=username,
+        password=password,
+        sender=ConfigService.get("MAIL_FROM") or MAIL_FROM or username,
+        use_tls=ConfigService.get_bool("SMTP_USE_TLS", default=True)
+    )
+
+
+class MailService:
+
+    # ================= ENQUEUE =================
+    @staticmethod
+    def enqueue(
+        db: Session,
+        to_email: str,
+        subject: str,
+        body: str,
+        subtype: str = "plain"
+    ):
+        """
+        Queue a message in the caller's transaction; it is sent once committed
+        """
+
+        db.add(MailOutbox(
+            recipient=to_email,
+            subject=subject,
+            body=body,
+            subtype=subtype
+        ))
+
+    @staticmethod
+    def enqueue_many(db: Session, messages: list[dict]):
+        """
+        Queue many messages (dicts of recipient, subject, body[, subtype])
+        """
+
+        db.add_all([MailOutbox(**message) for message in messages])
+
+    # ================= SEND BATCH =================
+    @staticmethod
+    def _retry_later(message: MailOutbox, error: Exception, now: datetime):
+
+        message.attempts += 1
+        message.last_error = str(error)[:1000]
+
+        if message.attempts >= MAIL_MAX_ATTEMPTS:
+            message.status = "failed"
+        else:
+            delay = MAIL_RETRY_BASE_SECONDS * 2 ** (message.attempts - 1)
+            message.next_attempt_at = now + timedelta(seconds=delay)
+
+    @staticmethod
+    def process_batch(
+        db: Session,
+        smtp_pool: SMTPConnectionPool,
+        batch_size: int = MAIL_BATCH_SIZE
+    ) -> int:
+        """
+        Send up to batch_size due messages over one pooled connection.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED so several workers can
+        drain the outbox together. Returns the number of messages handled.
+        """
+
+        messages = db.query(MailOutbox).filter(
+            MailOutbox.status == "pending",
+            MailOutbox.next_attempt_at <= func.now()
+        ).order_by(
+            MailOutbox.id
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not messages:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        handled = set()
+
+        try:
+            with smtp_pool.connection() as (server, settings):
+                for message in messages:
+
+                    mime = MIMEText(message.body, message.subtype)
+                    mime["Subject"] = message.subject
+                    mime["From"] = settings.sender
+                    mime["To"] = message.recipient
+
+                    try:
+                        server.sendmail(settings.sender, [message.recipient], mime.as_string())
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                        # This message only; the connection is still usable
+                        MailService._retry_later(message, e, now)
+                    else:
+                        message.status = "sent"
+                        message.sent_at = now
+
+                    handled.add(message.id)
+
+        except Exception as e:
+            logger.exception("Mail batch failed")
+
+            for message in messages:
+                if message.id not in handled:
+                    MailService._retry_later(message, e, now)
+
+        db.commit()
+
+        return len(messages)
+
+
+# ================= WORKER =================
+class MailWorker:
+    """
+    Drains the outbox in a background thread, reusing a warm SMTP connection
+    """
+
+    def __init__(self):
+        self.smtp_pool = SMTPConnectionPool(
+            load_smtp_settings,
+            idle_seconds=SMTP_IDLE_SECONDS
+        )
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+
+        db = SessionLocal()
+
+        try:
+            return MailService.process_batch(db, self.smtp_pool)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run_forever(self):
+
+        while not self._stop.is_set():
+
+            try:
+                handled = self.run_once()
+            except Exception:
+                logger.exception("Mail worker error")
+                handled = 0
+
+            # Keep draining while there is a backlog
+            if handled < MAIL_BATCH_SIZE:
+                self._stop.wait(MAIL_POLL_SECONDS)
+
+        self.smtp_pool.close_all()
+
+    def start(self):
+
+        self._thread = threading.Thread(
+            target=self.run_forever,
+            name="mail-worker",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+
+        self._stop.set()
+
+        if self._thread:
+            self._thread.join(timeout=MAIL_POLL_SECONDS + 5)
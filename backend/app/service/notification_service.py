@@ -0,0 +1,150 @@
+import os
+import threading
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from sqlalchemy.orm import Session
+
+from backend.app.service.mail_service import MailService
+from backend.app.config import NOTIFICATION_DEFAULT_LOCALE
+
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "templates", "email"
+)
+
+# Body file extension -> MIME subtype
+BODY_SUBTYPES = {
+    ".txt": "plain",
+    ".html": "html",
+}
+
+
+class NotificationService:
+    """
+    Renders email notifications from templates and queues them in the outbox.
+
+    Each notification is a pair of files per locale directory:
+    <name>.subject and <name>.txt or <name>.html.
+    """
+
+    _env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        # Subjects come from from_string and are plain text; only .html escapes
+        autoescape=select_autoescape(["html"], default_for_string=False),
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True
+    )
+
+    # (name, locale) -> (subject template, body template, subtype)
+    _templates = None
+    _lock = threading.Lock()
+
+    # ================= LOAD =================
+    @classmethod
+    def load(cls):
+        """
+        Compile every template once; called at startup
+        """
+
+        templates = {}
+
+        for locale in sorted(os.listdir(TEMPLATE_DIR)):
+
+            locale_dir = os.path.join(TEMPLATE_DIR, locale)
+
+            if not os.path.isdir(locale_dir):
+                continue
+
+            for filename in sorted(os.listdir(locale_dir)):
+
+                name, ext = os.path.splitext(filename)
+
+                if ext not in BODY_SUBTYPES:
+                    continue
+
+                subject_path = os.path.join(locale_dir, f"{name}.subject")
+
+                with open(subject_path, encoding="utf-8") as f:
+                    subject = cls._env.from_string(f.read().strip())
+
+                body = cls._env.get_template(f"{locale}/{filename}")
+
+                templates[(name, locale)] = (subject, body, BODY_SUBTYPES[ext])
+
+        with cls._lock:
+            cls._templates = templates
+
+    @classmethod
+    def _get(cls, name: str, locale: str | None):
+
+        if cls._templates is None:
+            cls.load()
+
+        locale = locale or NOTIFICATION_DEFAULT_LOCALE
+
+        template = cls._templates.get((name, locale)) or \
+            cls._templates.get((name, NOTIFICATION_DEFAULT_LOCALE))
+
+        if not template:
+            raise KeyError(f"Unknown notification template: {name}")
+
+        return template
+
+    # ================= RENDER =================
+    @classmethod
+    def render(cls, name: str, context: dict, locale: str | None = None) -> dict:
+        """
+        Return an outbox message dict (recipient is filled in by the caller)
+        """
+
+        subject, body, subtype = cls._get(name, locale)
+
+        return {
+            "subject": subject.render(context),
+            "body": body.render(context),
+            "subtype": subtype
+        }
+
+    # ================= NOTIFY =================
+    @classmethod
+    def notify(
+        cls,
+        db: Session,
+        name: str,
+        to_email: str,
+        context: dict,
+        locale: str | None = None
+    ):
+        """
+        Queue one notification in the caller's transaction
+        """
+
+        message = cls.render(name, context, locale)
+
+        MailService.enqueue(db, to_email, **message)
+
+    @classmethod
+    def notify_many(
+        cls,
+        db: Session,
+        name: str,
+        recipients: list[tuple[str, dict]],
+        locale: str | None = None
+    ):
+        """
+        Queue the same notification for many (email, context) pairs
+        """
+
+        subject, body, subtype = cls._get(name, locale)
+
+        MailService.enqueue_many(db, [
+            {
+                "recipient": to_email,
+                "subject": subject.render(context),
+                "body": body.render(context),
+                "subtype": subtype
+            }
+            for to_email, context in recipients
+            if to_email
+        ])
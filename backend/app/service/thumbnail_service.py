@@ -0,0 +1,109 @@
+import io
+import os
+import tempfile
+
+from backend.app.models.document import Document
+from backend.app.storage import ALLOWED_CONTENT_TYPES, get_storage
+from backend.app.config import THUMBNAIL_DIR
+
+try:
+    from PIL import Image
+except ImportError:
+    # Listed in requirements.txt; without it previews return 415
+    Image = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    # Listed in requirements.txt; without it PDFs get no preview
+    pdfium = None
+
+
+THUMBNAIL_SIZES = (128, 256, 512)
+
+
+class ThumbnailService:
+
+    @staticmethod
+    def available(document: Document) -> bool:
+
+        content_type = document.content_type or ""
+
+        if Image is None or content_type not in ALLOWED_CONTENT_TYPES:
+            return False
+
+        # Raster images, or the first page of a PDF; SVG and unknown types
+        # are never decoded
+        if content_type == "application/pdf":
+            return pdfium is not None
+
+        return content_type.startswith("image/")
+
+    @staticmethod
+    def _render(document: Document, size: int):
+
+        # Uploads are size-limited, and S3 bodies cannot seek, so read it all
+        with get_storage().open(document.storage_key) as source:
+            data = source.read()
+
+        if document.content_type != "application/pdf":
+            image = Image.open(io.BytesIO(data))
+            image.load()
+            return image
+
+        pdf = pdfium.PdfDocument(data)
+
+        try:
+            page = pdf[0]
+            scale = size / max(page.get_size())
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def get_path(document: Document, size: int) -> str:
+        """
+        Path of a JPEG preview, generated on first use and reused afterwards.
+
+        Content never changes under a hash, so the cache needs no invalidation.
+        """
+
+        path = os.path.join(THUMBNAIL_DIR, f"{document.sha256}_{size}.jpg")
+
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+
+        image = ThumbnailService._render(document, size)
+        image.thumbnail((size, size))
+
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        # Unique temp file per call, then rename, so concurrent renders of
+        # the same preview never publish a partial file
+        tmp = tempfile.NamedTemporaryFile(dir=THUMBNAIL_DIR, suffix=".tmp", delete=False)
+
+        try:
+            with tmp:
+                image.save(tmp, "JPEG", quality=80)
+
+            os.replace(tmp.name, path)
+
+        except BaseException:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            raise
+
+        return path
+
+    @staticmethod
+    def purge(sha256: str):
+        # Previews of content that no longer exists
+
+        for size in THUMBNAIL_SIZES:
+            try:
+                os.remove(os.path.join(THUMBNAIL_DIR, f"{sha256}_{size}.jpg"))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,54 @@
+"""
+File storage for uploaded documents.
+
+get_storage() returns the backend selected by STORAGE_BACKEND; save_upload()
+streams an UploadFile into it under a SHA-256 content key.
+"""
+
+import threading
+
+from backend.app.storage.base import StorageBackend
+from backend.app.storage.local import LocalStorage
+from backend.app.storage.uploads import (
+    ALLOWED_CONTENT_TYPES,
+    StoredUpload,
+    is_content_key,
+    save_upload,
+    save_file
+)
+from backend.app.config import (
+    STORAGE_BACKEND,
+    UPLOAD_DIR,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_REGION,
+    S3_ACCESS_KEY,
+    S3_SECRET_KEY
+)
+
+
+_storage = None
+_lock = threading.Lock()
+
+
+def get_storage() -> StorageBackend:
+
+    global _storage
+
+    with _lock:
+        if _storage is None:
+
+            if STORAGE_BACKEND == "s3":
+                from backend.app.storage.s3 import S3Storage
+
+                _storage = S3Storage(
+                    S3_BUCKET,
+                    endpoint_url=S3_ENDPOINT_URL,
+                    region=S3_REGION,
+                    access_key=S3_ACCESS_KEY,
+                    secret_key=S3_SECRET_KEY
+                )
+            else:
+                _storage = LocalStorage(UPLOAD_DIR)
+
+        return _storage
@@ -0,0 +1,41 @@
+from typing import BinaryIO, Iterator
+
+
+class StorageBackend:
+    """
+    Content-addressed blob store. Keys are derived from the SHA-256 of the
+    content, so a key is written at most once and never changes.
+    """
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def put_file(self, key: str, local_path: str, content_type: str | None = None):
+        """
+        Move a finished temporary file into the store under key
+        """
+        raise NotImplementedError
+
+    def open(self, key: str) -> BinaryIO:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def touch(self, key: str):
+        """
+        Mark an existing key as just written, so cleanup leaves it alone
+        """
+        raise NotImplementedError
+
+    def list_keys(self) -> Iterator[tuple[str, float]]:
+        """
+        Yield (key, last modified as a UNIX timestamp) for every stored blob
+        """
+        raise NotImplementedError
+
+    def staging_dir(self) -> str | None:
+        """
+        Where upload temp files go; None means the system temp directory
+        """
+        return None
@@ -0,0 +1,54 @@
+import os
+
+from backend.app.storage.base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+
+    def __init__(self, root: str):
+        self.root = root
+        self._staging = os.path.join(root, ".staging")
+        os.makedirs(self._staging, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def put_file(self, key: str, local_path: str, content_type: str | None = None):
+
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        # Same filesystem as the staging dir, so this is an atomic rename
+        os.replace(local_path, target)
+
+    def open(self, key: str):
+        return open(self.path(key), "rb")
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def touch(self, key: str):
+        os.utime(self.path(key))
+
+    def list_keys(self):
+
+        for prefix in sorted(os.listdir(self.root)):
+
+            directory = os.path.join(self.root, prefix)
+
+            # Content keys only; skips .staging and legacy top-level uploads
+            if len(prefix) != 2 or not os.path.isdir(directory):
+                continue
+
+            for name in os.listdir(directory):
+                key = f"{prefix}/{name}"
+                yield key, os.path.getmtime(self.path(key))
+
+    def staging_dir(self) -> str:
+        return self._staging
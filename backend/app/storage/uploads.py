@@ -0,0 +1,194 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.storage.base import StorageBackend
+from backend.app.config import UPLOAD_MAX_BYTES, UPLOAD_CHUNK_BYTES
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    key: str
+    sha256: str
+    size: int
+    content_type: str | None
+    filename: str | None
+
+
+# Proof types that are safe to render inline; anything else is refused at
+# upload and only ever served as a download
+ALLOWED_CONTENT_TYPES = {
+    "application/pdf",
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+}
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """
+    Content type from the file's leading bytes; the client's claim is not trusted
+    """
+
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+
+    return None
+
+
+def unsupported_type():
+    return HTTPException(
+        status_code=415,
+        detail="Proof documents must be PDF, PNG, JPEG, GIF or WebP files"
+    )
+
+
+def content_key(sha256: str) -> str:
+    # Fan out by hash prefix so no directory grows too large
+    return f"{sha256[:2]}/{sha256}"
+
+
+CONTENT_KEY = re.compile(r"[0-9a-f]{2}/[0-9a-f]{64}")
+
+
+def is_content_key(key: str) -> bool:
+    return CONTENT_KEY.fullmatch(key) is not None and key[:2] == key[3:5]
+
+
+def too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {UPLOAD_MAX_BYTES // (1024 * 1024)} MB upload limit"
+    )
+
+
+async def save_upload(
+    storage: StorageBackend,
+    upload: UploadFile,
+    max_bytes: int = UPLOAD_MAX_BYTES
+) -> StoredUpload:
+    """
+    Stream an upload into storage chunk by chunk.
+
+    Disk writes run in the thread pool, the size limit is enforced as soon as
+    it is crossed, and content already stored under the same SHA-256 is not
+    written again.
+    """
+
+    # Reject early when the client declared the size
+    if upload.size is not None and upload.size > max_bytes:
+        raise too_large()
+
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+
+    tmp = await run_in_threadpool(
+        tempfile.NamedTemporaryFile, delete=False, dir=storage.staging_dir()
+    )
+
+    try:
+        try:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+
+                if not chunk:
+                    break
+
+                if content_type is None:
+                    content_type = sniff_content_type(chunk)
+
+                    if content_type is None:
+                        raise unsupported_type()
+
+                size += len(chunk)
+
+                if size > max_bytes:
+                    raise too_large()
+
+                digest.update(chunk)
+                await run_in_threadpool(tmp.write, chunk)
+
+        finally:
+            await run_in_threadpool(tmp.close)
+
+        if content_type is None:
+            raise unsupported_type()
+
+        sha256 = digest.hexdigest()
+        key = content_key(sha256)
+
+        if await run_in_threadpool(storage.exists, key):
+            await run_in_threadpool(os.remove, tmp.name)
+            # Keep cleanup from removing a blob this request is about to use
+            await run_in_threadpool(storage.touch, key)
+        else:
+            await run_in_threadpool(storage.put_file, key, tmp.name, content_type)
+
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+
+    return StoredUpload(
+        key=key,
+        sha256=sha256,
+        size=size,
+        content_type=content_type,
+        filename=upload.filename
+    )
+
+
+def save_file(storage: StorageBackend, path: str) -> StoredUpload:
+    """
+    Blocking variant for files already on disk (e.g. legacy uploads)
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as source:
+        # Legacy files are kept whatever they are; unknown types get None and
+        # are only served as downloads
+        head = source.read(UPLOAD_CHUNK_BYTES)
+        content_type = sniff_content_type(head)
+        digest.update(head)
+
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_BYTES), b""):
+            digest.update(chunk)
+
+    sha256 = digest.hexdigest()
+    key = content_key(sha256)
+
+    if storage.exists(key):
+        storage.touch(key)
+    else:
+        tmp = tempfile.NamedTemporaryFile(delete=False, dir=storage.staging_dir())
+        tmp.close()
+        shutil.copyfile(path, tmp.name)
+        storage.put_file(key, tmp.name, content_type)
+
+    return StoredUpload(
+        key=key,
+        sha256=sha256,
+        size=os.path.getsize(path),
+        content_type=content_type,
+        filename=os.path.basename(path)
+    )
@@ -1,25 +1,43 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from backend.database.postgres import get_db
 from backend.app.models.user import User
-from backend.app.models.configuration import Configuration
-from backend.app.config import SECRET_KEY, ALGORITHM
+from backend.app.service.config_service import ConfigService
+from backend.app.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    USER_CACHE_TTL_SECONDS,
+    USER_CACHE_MAX_SIZE,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS
+)
+from backend.app.utils.cache import TTLCache
 
 
 # ================= PASSWORD HASHING =================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS
+)
 
-
-def hash_password(password: str):
-    return pwd_context.hash(password)
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing
+# off the event loop and caps how much CPU it can take from a worker
+hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
 
 
-def verify_password(plain_password: str, hashed_password: str):
+def _verify(plain_password: str, hashed_password: str):
     # 🔹 Prevent crash if password in DB is invalid
     if not hashed_password:
         return False
@@ -30,6 +48,32 @@ def verify_password(plain_password: str, hashed_password: str):
         return False
 
 
+def hash_password(password: str):
+    return hash_executor.submit(pwd_context.hash, password).result()
+
+
+def verify_password(plain_password: str, hashed_password: str):
+    return hash_executor.submit(_verify, plain_password, hashed_password).result()
+
+
+async def hash_password_async(password: str):
+    return await asyncio.wrap_future(hash_executor.submit(pwd_context.hash, password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await asyncio.wrap_future(
+        hash_executor.submit(_verify, plain_password, hashed_password)
+    )
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<cost>$...
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return False
+
+
 # ================= OAUTH2 =================
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -54,11 +98,45 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+# ================= USER PRINCIPAL =================
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    id: int
+    name: str
+    email: str
+    role: str
+    gender: str | None
+    manager_id: int | None
+    is_active: bool
+    resignation_status: str | None
+    last_working_day: date | None
+
+
+PRINCIPAL_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.role,
+    User.gender,
+    User.manager_id,
+    User.is_active,
+    User.resignation_status,
+    User.last_working_day,
+)
+
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    # Call after committing a change to any field of UserPrincipal
+    user_cache.pop(user_id)
+
+
 # ================= GET CURRENT USER =================
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-):
+) -> UserPrincipal:
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -78,10 +156,17 @@ def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
 
     if user is None:
-        raise credentials_exception
+
+        row = db.query(*PRINCIPAL_COLUMNS).filter(User.id == user_id).first()
+
+        if row is None:
+            raise credentials_exception
+
+        user = UserPrincipal(**row._asdict())
+        user_cache.set(user_id, user)
 
     # 🔹 Block resigned users
     if user.resignation_status == "APPROVED":
@@ -102,9 +187,4 @@ def get_current_user(
 
 # ================= HELPER FUNCTION =================
 def get_config(db: Session, key: str):
-
-    config = db.query(Configuration).filter(
-        Configuration.config_parameter == key
-    ).first()
-
-    return config.config_value if config else None
\ No newline at end of file
+    return ConfigService.get(key, db=db)
\ No newline at end of file
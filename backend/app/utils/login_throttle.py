@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from fastapi import HTTPException
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight operations per key (account, client IP) within one worker.
+
+    Only touched from the event loop between awaits, so no lock is needed.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = {}
+
+    @contextmanager
+    def hold(self, key: str):
+
+        if self._active.get(key, 0) >= self.limit:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many login attempts in progress. Please retry shortly."
+            )
+
+        self._active[key] = self._active.get(key, 0) + 1
+
+        try:
+            yield
+        finally:
+            remaining = self._active[key] - 1
+
+            if remaining:
+                self._active[key] = remaining
+            else:
+                del self._active[key]
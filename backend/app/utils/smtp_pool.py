@@ -0,0 +1,107 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SMTPSettings:
+    host: str
+    port: int
+    username: str | None
+    password: str | None
+    sender: str
+    use_tls: bool = True
+
+
+class SMTPConnectionPool:
+    """
+    Keeps logged-in SMTP connections warm between batches.
+
+    A connection is reused while it answers NOOP and has been idle for less
+    than idle_seconds; otherwise it is closed and a fresh one is opened. A
+    local debugging server works as a stand-in, e.g.
+
+        python -m aiosmtpd -n -l localhost:1025
+
+    with SMTP_SERVER=localhost, SMTP_PORT=1025, SMTP_USE_TLS=false.
+    """
+
+    def __init__(self, settings_loader, size: int = 1, idle_seconds: float = 60):
+        self.settings_loader = settings_loader
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _open(self, settings: SMTPSettings):
+
+        server = smtplib.SMTP(settings.host, settings.port, timeout=30)
+
+        if settings.use_tls:
+            server.starttls()
+
+        if settings.username and settings.password:
+            server.login(settings.username, settings.password)
+
+        return server
+
+    def _take(self, settings: SMTPSettings):
+
+        with self._lock:
+            while self._idle:
+                server, used_settings, last_used = self._idle.pop()
+
+                fresh = used_settings == settings and \
+                    time.monotonic() - last_used < self.idle_seconds
+
+                if fresh:
+                    try:
+                        if server.noop()[0] == 250:
+                            return server
+                    except smtplib.SMTPException:
+                        pass
+                    except OSError:
+                        pass
+
+                self._close(server)
+
+        return self._open(settings)
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """
+        Yield (server, settings); broken connections are discarded, not reused
+        """
+
+        settings = self.settings_loader()
+        server = self._take(settings)
+
+        try:
+            yield server, settings
+        except Exception:
+            self._close(server)
+            raise
+        else:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append((server, settings, time.monotonic()))
+                    return
+
+            self._close(server)
+
+    def close_all(self):
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for server, _, _ in idle:
+            self._close(server)
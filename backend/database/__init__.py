@@ -1,5 +1,13 @@
 from backend.app.models.user import User
 from backend.app.models.leave_request import LeaveRequest
-from backend.app.models.leave_balance import LeaveBalance
+from backend.app.models.leave_balance import LeaveBalance, LeaveBalanceVersion
 from backend.app.models.leave_logs import LeaveLog
 from backend.app.models.password_reset import PasswordReset
+from backend.app.models.leave_status_count import LeaveStatusCount
+from backend.app.models.leave_monthly_stat import LeaveMonthlyStat
+from backend.app.models.configuration import Configuration, ConfigurationVersion
+from backend.app.models.holidays import Holiday
+from backend.app.models.mail_outbox import MailOutbox
+from backend.app.models.notification_digest import NotificationDigest
+from backend.app.models.leave_balance_ledger import LeaveBalanceEntry, LeaveBalanceSnapshot
+from backend.app.models.document import Document
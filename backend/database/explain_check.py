@@ -0,0 +1,167 @@
+"""
+EXPLAIN-based regression check for the hot query shapes.
+
+Each query is planned with sequential scans disabled, then the plan is
+searched for the index it is expected to use. Queries the covering indexes
+answer completely must show an Index Only Scan on one of them, so a column
+added to the select list (or an id dropped from an INCLUDE) fails the check.
+If an index is missing or the query stops matching it, the check fails.
+
+Small development tables make the planner prefer sequential scans, so
+disabling them keeps the check independent of table size. An Index Only Scan
+is only chosen once the visibility map is current; pass vacuum=True (the
+CLI's --vacuum) to VACUUM ANALYZE the tables first.
+"""
+
+import json
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+INDEX_ONLY_SCAN = "Index Only Scan"
+
+VACUUM_TABLES = ["leave_requests", "leave_balances", "users", "leave_logs"]
+
+
+# (name, sql, params, expected indexes, must be an index-only scan)
+HOT_QUERIES = [
+    (
+        "leave overlap check",
+        """
+        SELECT id FROM leave_requests
+        WHERE user_id = :user_id
+          AND status IN ('Pending', 'Approved')
+          AND start_date <= :end_date
+          AND end_date >= :start_date
+        LIMIT 1
+        """,
+        {"user_id": 1, "start_date": "2026-01-01", "end_date": "2026-01-05"},
+        {"ix_leave_requests_user_status_dates"},
+        True,
+    ),
+    (
+        "pending leaves for a user",
+        """
+        SELECT id FROM leave_requests
+        WHERE user_id = :user_id AND status = 'Pending'
+        ORDER BY start_date
+        """,
+        {"user_id": 1},
+        {"ix_leave_requests_pending", "ix_leave_requests_user_status_dates"},
+        True,
+    ),
+    (
+        "leave balance lookup",
+        """
+        SELECT remaining_leaves FROM leave_balances
+        WHERE user_id = :user_id AND leave_type = :leave_type
+          AND year = :year AND quarter = :quarter
+        """,
+        {"user_id": 1, "leave_type": "CASUAL", "year": 2026, "quarter": 1},
+        {"uq_leave_balances_key"},
+        # Balance columns are updated on every decision, so they are
+        # deliberately left out of the key index
+        False,
+    ),
+    (
+        "yearly balance summary",
+        """
+        SELECT leave_type, quarter, leaves_taken, remaining_leaves
+        FROM leave_balances
+        WHERE user_id = :user_id AND year = :year
+        """,
+        {"user_id": 1, "year": 2026},
+        {"uq_leave_balances_key"},
+        # Balance columns are updated on every decision, so they are
+        # deliberately left out of the key index
+        False,
+    ),
+    (
+        "manager team members",
+        "SELECT id FROM users WHERE manager_id = :manager_id",
+        {"manager_id": 1},
+        {"ix_users_manager_id"},
+        True,
+    ),
+    (
+        "team leave history page",
+        """
+        SELECT id FROM leave_requests
+        WHERE user_id = :user_id AND id < :cursor
+        ORDER BY id DESC
+        LIMIT 50
+        """,
+        {"user_id": 1, "cursor": 1000},
+        {"ix_leave_requests_user_id_id"},
+        True,
+    ),
+    (
+        "leave audit log",
+        "SELECT id FROM leave_logs WHERE leave_id = :leave_id",
+        {"leave_id": 1},
+        {"ix_leave_logs_leave_id"},
+        False,
+    ),
+]
+
+
+def plan_indexes(plan: dict) -> set:
+    # Collect every (node type, index name) in a JSON plan tree
+    found = set()
+
+    if "Index Name" in plan:
+        found.add((plan["Node Type"], plan["Index Name"]))
+
+    for child in plan.get("Plans", []):
+        found |= plan_indexes(child)
+
+    return found
+
+
+def vacuum_analyze(engine: Engine, tables=VACUUM_TABLES):
+    # VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as conn:
+        for table in tables:
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def run_explain_check(engine: Engine, queries=HOT_QUERIES, vacuum=False) -> list:
+    """
+    Return a list of (name, ok, scans_used) tuples
+    """
+
+    if vacuum:
+        vacuum_analyze(engine)
+
+    results = []
+
+    with engine.connect() as conn:
+        for name, sql, params, expected, index_only in queries:
+
+            with conn.begin():
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+                plan = conn.execute(
+                    text(f"EXPLAIN (FORMAT JSON) {sql}"), params
+                ).scalar()
+
+                # psycopg2 decodes json columns; fall back for raw text
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                used = plan_indexes(plan[0]["Plan"])
+
+            matched = {
+                node for node, index in used if index in expected
+            }
+
+            if index_only:
+                ok = INDEX_ONLY_SCAN in matched
+            else:
+                ok = bool(matched)
+
+            results.append((name, ok, used))
+
+    return results
@@ -0,0 +1,110 @@
+"""
+Versioned schema migrations.
+
+Base.metadata.create_all only creates missing tables, so changes to existing
+tables (indexes, constraints, columns) live in backend/database/migrations/versions
+as modules named vNNNN_<description>.py, each exposing:
+
+    VERSION = NNNN
+    DESCRIPTION = "..."
+    def upgrade(conn): ...
+
+Applied versions are recorded in schema_migrations. Every migration runs in
+its own transaction, and a Postgres advisory lock keeps concurrently starting
+workers from applying the same version twice.
+"""
+
+import importlib
+import logging
+import pkgutil
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from backend.database.migrations import versions
+
+
+logger = logging.getLogger(__name__)
+
+
+# Arbitrary constant shared by every worker
+MIGRATION_LOCK_ID = 7413021
+
+
+def load_migrations():
+
+    migrations = []
+
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name.startswith("v"):
+            continue
+
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(module)
+
+    migrations.sort(key=lambda m: m.VERSION)
+
+    seen = set()
+    for migration in migrations:
+        if migration.VERSION in seen:
+            raise RuntimeError(f"Duplicate migration version {migration.VERSION}")
+        seen.add(migration.VERSION)
+
+    return migrations
+
+
+def applied_versions(conn) -> set:
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        )
+    """))
+
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(engine: Engine) -> list:
+    """
+    Apply every pending migration in version order; returns the versions applied
+    """
+
+    applied_now = []
+
+    with engine.connect() as lock_conn:
+        # Waiting for another worker's migrations must not hit the app's
+        # statement_timeout; SET LOCAL ends with the commit below
+        lock_conn.execute(text("SET LOCAL statement_timeout = 0"))
+        lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+        try:
+            with engine.begin() as conn:
+                done = applied_versions(conn)
+
+            for migration in load_migrations():
+
+                if migration.VERSION in done:
+                    continue
+
+                with engine.begin() as conn:
+                    # Index builds and table rewrites run longer than requests
+                    conn.execute(text("SET LOCAL statement_timeout = 0"))
+                    migration.upgrade(conn)
+
+                    conn.execute(
+                        text("""
+                            INSERT INTO schema_migrations (version, description)
+                            VALUES (:version, :description)
+                        """),
+                        {"version": migration.VERSION, "description": migration.DESCRIPTION}
+                    )
+
+                applied_now.append(migration.VERSION)
+                logger.info("Applied migration %s: %s", migration.VERSION, migration.DESCRIPTION)
+
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            lock_conn.commit()
+
+    return applied_now
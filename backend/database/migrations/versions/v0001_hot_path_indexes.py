@@ -0,0 +1,79 @@
+from sqlalchemy import text
+
+
+VERSION = 1
+DESCRIPTION = "Composite and partial indexes for the hot query shapes"
+
+
+def upgrade(conn):
+
+    # Overlap check in /leave/apply and per-user history
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_requests_user_status_dates
+        ON leave_requests (user_id, status, start_date, end_date)
+    """))
+
+    # Pending queue only; stays small however long the history grows
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_requests_pending
+        ON leave_requests (user_id, start_date)
+        WHERE status = 'Pending'
+    """))
+
+    # /manager/team
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_users_manager_id
+        ON users (manager_id)
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_logs_leave_id
+        ON leave_logs (leave_id)
+    """))
+
+    # One balance row per (user, type, year, quarter). Earlier code could
+    # create duplicates and deduct from any of them, so fold every
+    # duplicate's days into the oldest row of its key before deleting the
+    # rest: taken is summed, and the allowance (taken + remaining) is the
+    # one each duplicate was created with. Rows with a NULL key column are
+    # not duplicates (the DELETE's = never matches them, and the unique
+    # constraint allows them), so both statements leave them alone.
+    conn.execute(text("""
+        UPDATE leave_balances b
+        SET leaves_taken = dup.taken,
+            remaining_leaves = dup.granted - dup.taken
+        FROM (
+            SELECT min(id) AS keep_id,
+                   sum(coalesce(leaves_taken, 0)) AS taken,
+                   max(coalesce(leaves_taken, 0) + coalesce(remaining_leaves, 0)) AS granted
+            FROM leave_balances
+            WHERE user_id IS NOT NULL
+              AND leave_type IS NOT NULL
+              AND year IS NOT NULL
+              AND quarter IS NOT NULL
+            GROUP BY user_id, leave_type, year, quarter
+            HAVING count(*) > 1
+        ) dup
+        WHERE b.id = dup.keep_id
+    """))
+
+    conn.execute(text("""
+        DELETE FROM leave_balances b
+        USING leave_balances keep
+        WHERE b.user_id = keep.user_id
+          AND b.leave_type = keep.leave_type
+          AND b.year = keep.year
+          AND b.quarter = keep.quarter
+          AND b.id > keep.id
+    """))
+
+    exists = conn.execute(text("""
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_leave_balances_key'
+    """)).first()
+
+    if not exists:
+        conn.execute(text("""
+            ALTER TABLE leave_balances
+            ADD CONSTRAINT uq_leave_balances_key
+            UNIQUE (user_id, leave_type, year, quarter)
+        """))
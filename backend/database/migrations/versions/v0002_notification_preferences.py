@@ -0,0 +1,24 @@
+from sqlalchemy import text
+
+
+VERSION = 2
+DESCRIPTION = "Per-user immediate notification opt-out for digests"
+
+
+def upgrade(conn):
+
+    conn.execute(text("""
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS immediate_notifications BOOLEAN NOT NULL DEFAULT false
+    """))
+
+    # Digest scan of recent activity
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_requests_created_at
+        ON leave_requests (created_at)
+    """))
+
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_logs_timestamp
+        ON leave_logs (timestamp)
+    """))
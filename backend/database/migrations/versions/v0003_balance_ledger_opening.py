@@ -0,0 +1,29 @@
+from sqlalchemy import text
+
+
+VERSION = 3
+DESCRIPTION = "Opening balance ledger entries for existing leave balances"
+
+
+def upgrade(conn):
+
+    # The ledger tables are created by create_all; seed one opening entry per
+    # existing balance so ledger totals match the projection from day one
+    conn.execute(text("""
+        INSERT INTO leave_balance_ledger
+            (user_id, leave_type, year, quarter, kind, granted_days, taken_days)
+        SELECT b.user_id, b.leave_type, b.year, b.quarter, 'opening',
+               coalesce(b.leaves_taken, 0) + coalesce(b.remaining_leaves, 0),
+               coalesce(b.leaves_taken, 0)
+        FROM leave_balances b
+        WHERE b.leave_type IS NOT NULL
+          AND b.year IS NOT NULL
+          AND b.quarter IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM leave_balance_ledger e
+              WHERE e.user_id = b.user_id
+                AND e.leave_type = b.leave_type
+                AND e.year = b.year
+                AND e.quarter = b.quarter
+          )
+    """))
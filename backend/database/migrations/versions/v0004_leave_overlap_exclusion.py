@@ -0,0 +1,44 @@
+from sqlalchemy import text
+
+
+VERSION = 4
+DESCRIPTION = "Exclusion constraint against overlapping pending/approved leaves"
+
+
+def upgrade(conn):
+
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+
+    # Generated, so inserts and updates never have to set it
+    conn.execute(text("""
+        ALTER TABLE leave_requests
+        ADD COLUMN IF NOT EXISTS period daterange
+        GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED
+    """))
+
+    # The constraint cannot be added while overlapping rows exist
+    overlapping = conn.execute(text("""
+        SELECT a.id, b.id
+        FROM leave_requests a
+        JOIN leave_requests b
+          ON a.user_id = b.user_id
+         AND a.id < b.id
+         AND a.period && b.period
+        WHERE a.status IN ('Pending', 'Approved')
+          AND b.status IN ('Pending', 'Approved')
+        LIMIT 20
+    """)).all()
+
+    if overlapping:
+        pairs = ", ".join(f"{a}/{b}" for a, b in overlapping)
+        raise RuntimeError(
+            "Overlapping pending/approved leave requests must be cancelled "
+            f"or rejected before this migration can run (leave ids: {pairs})"
+        )
+
+    conn.execute(text("""
+        ALTER TABLE leave_requests
+        ADD CONSTRAINT ex_leave_requests_no_overlap
+        EXCLUDE USING gist (user_id WITH =, period WITH &&)
+        WHERE (status IN ('Pending', 'Approved'))
+    """))
@@ -0,0 +1,14 @@
+from sqlalchemy import text
+
+
+VERSION = 5
+DESCRIPTION = "Link leave requests to content-addressed documents"
+
+
+def upgrade(conn):
+
+    # documents itself is created by create_all
+    conn.execute(text("""
+        ALTER TABLE leave_requests
+        ADD COLUMN IF NOT EXISTS document_id INTEGER REFERENCES documents (id)
+    """))
@@ -0,0 +1,17 @@
+from sqlalchemy import text
+
+
+VERSION = 6
+DESCRIPTION = "Index for team leave history pages"
+
+
+def upgrade(conn):
+
+    # Status normalization lives in v0012, together with the rebuild of the
+    # v0004 exclusion constraint it depends on
+
+    # Team history pages walk each member's leaves newest first
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS ix_leave_requests_user_id_id
+        ON leave_requests (user_id, id DESC)
+    """))
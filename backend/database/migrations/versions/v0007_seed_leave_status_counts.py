@@ -0,0 +1,21 @@
+from sqlalchemy import text
+
+
+VERSION = 7
+DESCRIPTION = "Seed the leave status rollup from existing leave requests"
+
+
+def upgrade(conn):
+
+    # Hold off writers so no transition lands between the count and the swap
+    conn.execute(text("LOCK TABLE leave_requests IN SHARE MODE"))
+
+    # Replaces anything record_transition wrote before the seed existed
+    conn.execute(text("DELETE FROM leave_status_counts"))
+
+    conn.execute(text("""
+        INSERT INTO leave_status_counts (status, total)
+        SELECT initcap(coalesce(status, 'Pending')), count(*)
+        FROM leave_requests
+        GROUP BY 1
+    """))
@@ -0,0 +1,26 @@
+from sqlalchemy import text
+
+
+VERSION = 8
+DESCRIPTION = "Seed the monthly leave rollup from existing leave requests"
+
+
+def upgrade(conn):
+
+    # Same approach as v0007: block writers, then replace whatever live
+    # transitions added before the rollup was seeded
+    conn.execute(text("LOCK TABLE leave_requests IN SHARE MODE"))
+
+    conn.execute(text("DELETE FROM leave_monthly_stats"))
+
+    conn.execute(text("""
+        INSERT INTO leave_monthly_stats (year, month, leave_type, status, total, days)
+        SELECT extract(year FROM start_date)::int,
+               extract(month FROM start_date)::int,
+               leave_type,
+               initcap(coalesce(status, 'Pending')),
+               count(*),
+               coalesce(sum(number_of_days), 0)
+        FROM leave_requests
+        GROUP BY 1, 2, 3, 4
+    """))
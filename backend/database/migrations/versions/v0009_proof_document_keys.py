@@ -0,0 +1,18 @@
+from sqlalchemy import text
+
+
+VERSION = 9
+DESCRIPTION = "Store proof_document as the document's storage key everywhere"
+
+
+def upgrade(conn):
+
+    # Early content-addressed uploads were saved as "uploads/<key>"; new
+    # uploads and import-documents store the bare key
+    conn.execute(text("""
+        UPDATE leave_requests l
+        SET proof_document = d.storage_key
+        FROM documents d
+        WHERE l.document_id = d.id
+          AND l.proof_document IS DISTINCT FROM d.storage_key
+    """))
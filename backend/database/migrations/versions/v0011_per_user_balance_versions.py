@@ -0,0 +1,12 @@
+from sqlalchemy import text
+
+
+# 10 was used by a dropped migration and is not reused
+VERSION = 11
+DESCRIPTION = "Replace the single balance cache version row with per-user versions"
+
+
+def upgrade(conn):
+
+    # leave_balance_versions is created by create_all
+    conn.execute(text("DROP TABLE IF EXISTS leave_balance_version"))
@@ -0,0 +1,70 @@
+from sqlalchemy import text
+
+
+VERSION = 12
+DESCRIPTION = "Normalize leave status casing and rebuild the overlap constraint"
+
+
+def upgrade(conn):
+
+    # The v0004 constraint only covers exact 'Pending'/'Approved' rows, so
+    # "PENDING" rows written by older code slipped past it. Drop it first:
+    # normalizing with it in place could hit 23P01 halfway through.
+    conn.execute(text("""
+        ALTER TABLE leave_requests DROP CONSTRAINT IF EXISTS ex_leave_requests_no_overlap
+    """))
+
+    # Older code wrote "PENDING" / "APPROVED"; everything else uses "Pending"
+    conn.execute(text("""
+        UPDATE leave_requests
+        SET status = initcap(coalesce(status, 'Pending'))
+        WHERE status IS NULL OR status <> initcap(status)
+    """))
+
+    conn.execute(text("""
+        ALTER TABLE leave_requests ALTER COLUMN status SET DEFAULT 'Pending'
+    """))
+
+    conn.execute(text("""
+        ALTER TABLE leave_requests ALTER COLUMN status SET NOT NULL
+    """))
+
+    exists = conn.execute(text("""
+        SELECT 1 FROM pg_constraint WHERE conname = 'ck_leave_requests_status'
+    """)).first()
+
+    # Keeps mixed-case writes from coming back
+    if not exists:
+        conn.execute(text("""
+            ALTER TABLE leave_requests
+            ADD CONSTRAINT ck_leave_requests_status
+            CHECK (status IN ('Pending', 'Approved', 'Rejected', 'Cancelled'))
+        """))
+
+    # Now that every row is visible to it, the constraint can only be rebuilt
+    # if no overlaps exist
+    overlapping = conn.execute(text("""
+        SELECT a.id, b.id
+        FROM leave_requests a
+        JOIN leave_requests b
+          ON a.user_id = b.user_id
+         AND a.id < b.id
+         AND a.period && b.period
+        WHERE a.status IN ('Pending', 'Approved')
+          AND b.status IN ('Pending', 'Approved')
+        LIMIT 20
+    """)).all()
+
+    if overlapping:
+        pairs = ", ".join(f"{a}/{b}" for a, b in overlapping)
+        raise RuntimeError(
+            "Overlapping pending/approved leave requests must be cancelled "
+            f"or rejected before this migration can run (leave ids: {pairs})"
+        )
+
+    conn.execute(text("""
+        ALTER TABLE leave_requests
+        ADD CONSTRAINT ex_leave_requests_no_overlap
+        EXCLUDE USING gist (user_id WITH =, period WITH &&)
+        WHERE (status IN ('Pending', 'Approved'))
+    """))
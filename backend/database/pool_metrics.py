@@ -0,0 +1,109 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Checkout wait-time counters for one connection pool
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, outcome: str = "ok"):
+        """
+        outcome is "ok", "timeout" (pool exhausted) or "error" (connect failed)
+        """
+
+        with self._lock:
+            if outcome == "timeout":
+                self.timeouts += 1
+            elif outcome == "error":
+                self.errors += 1
+            else:
+                self.checkouts += 1
+
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self) -> dict:
+
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(
+                    self.wait_seconds_total / self.checkouts, 6
+                ) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6)
+            }
+
+
+def _instrument(pool_class):
+
+    class InstrumentedPool(pool_class):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.metrics = PoolMetrics()
+
+        def recreate(self):
+            pool = super().recreate()
+            pool.metrics = self.metrics
+            return pool
+
+        # _do_get is where QueuePool blocks waiting for a free connection
+        def _do_get(self):
+            started = time.perf_counter()
+
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.metrics.record(time.perf_counter() - started, "timeout")
+                raise
+            except Exception:
+                # Refused connections, bad credentials, ...: not pool pressure
+                self.metrics.record(time.perf_counter() - started, "error")
+                raise
+
+            self.metrics.record(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+InstrumentedQueuePool = _instrument(QueuePool)
+InstrumentedAsyncQueuePool = _instrument(AsyncAdaptedQueuePool)
+
+
+def pool_status(engine) -> dict:
+    """
+    Current pool occupancy plus wait-time counters for an engine
+    """
+
+    pool = engine.pool
+
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+
+    metrics = getattr(pool, "metrics", None)
+
+    if metrics is not None:
+        status.update(metrics.snapshot())
+
+    return status
@@ -1,8 +1,8 @@
 import API from "./axiosInstance";
 
-// 🔹 Get all leaves
-export const getAllLeaves = () => {
-  return API.get("/admin/leaves");
+// 🔹 Get all leaves (one page, pass next_cursor as cursor for the next)
+export const getAllLeaves = (params = {}) => {
+  return API.get("/admin/leaves", { params });
 };
 
 // 🔹 Approve leave
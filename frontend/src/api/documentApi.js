@@ -0,0 +1,41 @@
+import API from "./axiosInstance";
+
+// Types the backend serves inline; must match ALLOWED_CONTENT_TYPES
+const VIEWABLE_TYPES = [
+  "application/pdf",
+  "image/png",
+  "image/jpeg",
+  "image/gif",
+  "image/webp"
+];
+
+// ================= OPEN PROOF DOCUMENT =================
+// Fetched through the API so the auth header is sent. Only allowlisted types
+// are shown from a blob URL; anything else is downloaded, never navigated to,
+// so it cannot run in this origin.
+export const openDocument = async (documentId) => {
+  const response = await API.get(`/documents/${documentId}`, {
+    responseType: "blob"
+  });
+
+  const blob = response.data;
+  const type = (blob.type || "").split(";")[0].trim().toLowerCase();
+
+  if (VIEWABLE_TYPES.includes(type)) {
+    const url = URL.createObjectURL(blob);
+    window.open(url, "_blank", "noopener");
+    setTimeout(() => URL.revokeObjectURL(url), 60000);
+    return;
+  }
+
+  const url = URL.createObjectURL(
+    new Blob([blob], { type: "application/octet-stream" })
+  );
+
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = `document-${documentId}`;
+  link.click();
+
+  setTimeout(() => URL.revokeObjectURL(url), 60000);
+};
@@ -1,7 +1,8 @@
 import API from "./axiosInstance";
 
-export const getPendingLeaves = () => {
-  return API.get("/manager/team");
+// { items, next_cursor, balances }; pass status: "all" for history
+export const getPendingLeaves = (params = {}) => {
+  return API.get("/manager/team", { params });
 };
 
 export const approveLeave = (id, remarks) => {
@@ -10,4 +11,4 @@ export const approveLeave = (id, remarks) => {
 
 export const rejectLeave = (id, remarks) => {
   return API.put(`/manager/leave/${id}/reject`, remarks);
-};
\ No newline at end of file
+};
@@ -6,12 +6,14 @@ import {
 } from "../../api/adminApi";
 
 import API from "../../api/axiosInstance";
+import { openDocument } from "../../api/documentApi";
 
 import "../../styles/admin.css";
 
 const AllLeaveApprovals = () => {
 
   const [leaves, setLeaves] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [month, setMonth] = useState("");
   const [employee, setEmployee] = useState("");
   const [leaveType, setLeaveType] = useState("");
@@ -19,7 +21,19 @@ const AllLeaveApprovals = () => {
   const fetchLeaves = async () => {
     try {
       const res = await getAllLeaves();
-      setLeaves(Array.isArray(res.data) ? res.data : []);
+      setLeaves(Array.isArray(res.data?.items) ? res.data.items : []);
+      setNextCursor(res.data?.next_cursor ?? null);
+    } catch (error) {
+      console.error("Failed to fetch leaves");
+    }
+  };
+
+  // 🔹 Next page of leaves
+  const loadMore = async () => {
+    try {
+      const res = await getAllLeaves({ cursor: nextCursor });
+      setLeaves((prev) => [...prev, ...(res.data?.items || [])]);
+      setNextCursor(res.data?.next_cursor ?? null);
     } catch (error) {
       console.error("Failed to fetch leaves");
     }
@@ -44,6 +58,8 @@ const fetchReports = async () => {
     });
 
     setLeaves(Array.isArray(res.data) ? res.data : []);
+    // Reports come back whole; no further pages
+    setNextCursor(null);
 
   } catch (error) {
     console.error("Failed to fetch reports", error);
@@ -182,12 +198,8 @@ const fetchReports = async () => {
                 </td>
 
                 <td>
-  {leave.proof_document ? (
-    <button
-      onClick={() =>
-        window.open(`http://localhost:8000/${leave.proof_document}`)
-      }
-    >
+  {leave.document_id ? (
+    <button onClick={() => openDocument(leave.document_id)}>
       Preview
     </button>
   ) : (
@@ -216,6 +228,12 @@ const fetchReports = async () => {
           </tbody>
         </table>
       )}
+
+      {nextCursor && (
+        <button className="load-more-btn" onClick={loadMore}>
+          Load more
+        </button>
+      )}
     </div>
   );
 };
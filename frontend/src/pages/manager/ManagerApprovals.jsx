@@ -4,11 +4,13 @@ import {
   approveLeave,
   rejectLeave
 } from "../../api/managerApi";
+import { openDocument } from "../../api/documentApi";
 import "../../styles/manager.css";
 
 const ManagerApprovals = () => {
 
   const [leaves, setLeaves] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [search, setSearch] = useState("");
   const [selectedLeave, setSelectedLeave] = useState(null);
@@ -21,11 +23,8 @@ const ManagerApprovals = () => {
 
       const res = await getPendingLeaves();
 
-      if (Array.isArray(res.data)) {
-        setLeaves(res.data);
-      } else {
-        setLeaves([]);
-      }
+      setLeaves(res.data.items || []);
+      setNextCursor(res.data.next_cursor);
 
     } catch (error) {
 
@@ -42,6 +41,24 @@ const ManagerApprovals = () => {
     fetchLeaves();
   }, []);
 
+  // 🔹 Next page of team leave requests
+  const loadMore = async () => {
+
+    try {
+
+      const res = await getPendingLeaves({ cursor: nextCursor });
+
+      setLeaves((prev) => [...prev, ...(res.data.items || [])]);
+      setNextCursor(res.data.next_cursor);
+
+    } catch (error) {
+
+      console.log("Error fetching leaves:", error.response?.data);
+
+    }
+
+  };
+
   // 🔹 Approve / Reject confirmation
   const confirmAction = async () => {
 
@@ -137,14 +154,10 @@ const ManagerApprovals = () => {
                   </span>
                 </td>
 <td>
-  {leave.proof_document ? (
-    <a
-      href={`http://localhost:8000/${leave.proof_document}`}
-      target="_blank"
-      rel="noreferrer"
-    >
+  {leave.document_id ? (
+    <button onClick={() => openDocument(leave.document_id)}>
       View
-    </a>
+    </button>
   ) : (
     "No Proof"
   )}
@@ -183,6 +196,12 @@ const ManagerApprovals = () => {
 
       )}
 
+      {nextCursor && (
+        <button className="load-more-btn" onClick={loadMore}>
+          Load more
+        </button>
+      )}
+
       {/* 🔹 Confirmation Modal */}
       {selectedLeave && (
 
@@ -0,0 +1,132 @@
+import os
+import threading
+from datetime import date
+import pytest
+
+# The models bind to the test database when imported
+if not os.getenv("TEST_DATABASE_URL"):
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from fastapi import HTTPException
+
+from backend.app.models.leave_balance import LeaveBalance
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.models.leave_balance_ledger import LeaveBalanceEntry
+from backend.app.service.approval_service import ApprovalService
+
+
+def remaining(db, balance):
+    db.expire_all()
+    return float(db.get(LeaveBalance, balance.id).remaining_leaves)
+
+
+def test_approve_deducts_balance_once(db, make_user, make_balance, make_leave):
+    admin = make_user("ADMIN")
+    employee = make_user()
+    balance = make_balance(employee, 5)
+    leave = make_leave(employee, date(2026, 1, 5), date(2026, 1, 6), days=2)
+
+    ApprovalService.approve_leave(db, leave.id, "ADMIN", admin.id)
+    db.commit()
+
+    assert remaining(db, balance) == 3
+    assert db.get(LeaveRequest, leave.id).status == "Approved"
+    assert db.query(LeaveBalanceEntry).filter_by(leave_id=leave.id, kind="deduct").count() == 1
+
+    with pytest.raises(HTTPException) as error:
+        ApprovalService.approve_leave(db, leave.id, "ADMIN", admin.id)
+
+    assert error.value.detail == "Leave already processed"
+    db.rollback()
+    assert remaining(db, balance) == 3
+
+
+def test_guarded_update_refuses_overdraw(db, make_user, make_balance, make_leave):
+    admin = make_user("ADMIN")
+    employee = make_user()
+    balance = make_balance(employee, 1)
+    leave = make_leave(employee, date(2026, 1, 5), date(2026, 1, 6), days=2)
+
+    with pytest.raises(HTTPException) as error:
+        ApprovalService.approve_leave(db, leave.id, "ADMIN", admin.id)
+
+    assert error.value.detail == "Insufficient leave balance"
+    db.rollback()
+
+    assert remaining(db, balance) == 1
+    assert db.get(LeaveRequest, leave.id).status == "Pending"
+
+
+def test_manager_cannot_approve_other_teams(db, make_user, make_balance, make_leave):
+    manager = make_user("MANAGER")
+    other_manager = make_user("MANAGER")
+    employee = make_user(manager_id=other_manager.id)
+    balance = make_balance(employee, 5)
+    leave = make_leave(employee)
+
+    with pytest.raises(HTTPException) as error:
+        ApprovalService.approve_leave(db, leave.id, "MANAGER", manager.id)
+
+    assert error.value.status_code == 403
+    db.rollback()
+    assert remaining(db, balance) == 5
+
+
+def test_reject_after_approve_is_refused(db, make_user, make_balance, make_leave):
+    admin = make_user("ADMIN")
+    employee = make_user()
+    balance = make_balance(employee, 5)
+    leave = make_leave(employee, date(2026, 1, 5), date(2026, 1, 6), days=2)
+
+    ApprovalService.approve_leave(db, leave.id, "ADMIN", admin.id)
+    db.commit()
+
+    with pytest.raises(HTTPException):
+        ApprovalService.reject_leave(db, leave.id, "ADMIN", admin.id)
+
+    db.rollback()
+    assert remaining(db, balance) == 3
+
+
+def test_concurrent_approvals_cannot_overdraw(session_factory, db, make_user, make_balance, make_leave):
+    admin = make_user("ADMIN")
+    employee = make_user()
+    balance = make_balance(employee, 3)
+
+    # Two non-overlapping 2-day leaves drawing on the same 3-day balance
+    leaves = [
+        make_leave(employee, date(2026, 1, 5), date(2026, 1, 6), days=2),
+        make_leave(employee, date(2026, 1, 12), date(2026, 1, 13), days=2),
+    ]
+
+    # Ids are read here; the fixture session must not be used from threads
+    admin_id = admin.id
+    leave_ids = [leave.id for leave in leaves]
+
+    barrier = threading.Barrier(len(leave_ids))
+    outcomes = []
+
+    def approve(leave_id):
+        session = session_factory()
+
+        try:
+            barrier.wait()
+            ApprovalService.approve_leave(session, leave_id, "ADMIN", admin_id)
+            session.commit()
+            outcomes.append("approved")
+        except HTTPException as e:
+            session.rollback()
+            outcomes.append(e.detail)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=approve, args=(leave_id,)) for leave_id in leave_ids]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert sorted(outcomes) == ["Insufficient leave balance", "approved"]
+    assert remaining(db, balance) == 1
@@ -0,0 +1,76 @@
+import os
+from datetime import date
+from types import SimpleNamespace
+import pytest
+
+# The models bind to the test database when imported
+if not os.getenv("TEST_DATABASE_URL"):
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.models.leave_request import LeaveRequest
+from backend.app.service.leave_validation_service import is_overlap_violation
+
+
+def leave_for(user, start_date, end_date, status="Pending"):
+    return LeaveRequest(
+        user_id=user.id,
+        leave_type="CASUAL",
+        start_date=start_date,
+        end_date=end_date,
+        number_of_days=1,
+        status=status
+    )
+
+
+def test_overlapping_leave_is_rejected_by_the_constraint(db, make_user, make_leave):
+    employee = make_user()
+    make_leave(employee, date(2026, 1, 5), date(2026, 1, 9))
+
+    db.add(leave_for(employee, date(2026, 1, 9), date(2026, 1, 12)))
+
+    with pytest.raises(IntegrityError) as error:
+        db.flush()
+
+    assert is_overlap_violation(error.value)
+
+
+@pytest.mark.parametrize("status", ["Rejected", "Cancelled"])
+def test_closed_leaves_do_not_block(db, make_user, make_leave, status):
+    employee = make_user()
+    make_leave(employee, date(2026, 1, 5), date(2026, 1, 9), status=status)
+
+    db.add(leave_for(employee, date(2026, 1, 5), date(2026, 1, 9)))
+    db.flush()
+
+
+def test_adjacent_and_other_users_leaves_do_not_block(db, make_user, make_leave):
+    employee = make_user()
+    colleague = make_user()
+    make_leave(employee, date(2026, 1, 5), date(2026, 1, 9))
+
+    db.add_all([
+        leave_for(employee, date(2026, 1, 10), date(2026, 1, 12)),
+        leave_for(colleague, date(2026, 1, 5), date(2026, 1, 9)),
+    ])
+    db.flush()
+
+
+def test_reopening_into_an_overlap_is_rejected(db, make_user, make_leave):
+    employee = make_user()
+    make_leave(employee, date(2026, 1, 5), date(2026, 1, 9))
+    cancelled = make_leave(employee, date(2026, 1, 7), date(2026, 1, 8), status="Cancelled")
+
+    cancelled.status = "Pending"
+
+    with pytest.raises(IntegrityError) as error:
+        db.flush()
+
+    assert is_overlap_violation(error.value)
+
+
+def test_other_integrity_errors_are_not_overlaps():
+    unique_violation = IntegrityError("INSERT", {}, SimpleNamespace(pgcode="23505"))
+
+    assert not is_overlap_violation(unique_violation)
@@ -0,0 +1,123 @@
+import os
+import smtplib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import pytest
+
+# The models bind to the test database when imported
+if not os.getenv("TEST_DATABASE_URL"):
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from backend.app.models.mail_outbox import MailOutbox
+from backend.app.service.mail_service import MailService
+from backend.app.utils.smtp_pool import SMTPSettings
+
+
+SETTINGS = SMTPSettings(
+    host="localhost", port=1025, username=None, password=None,
+    sender="leave@example.com", use_tls=False
+)
+
+
+class FakeServer:
+
+    def __init__(self, refused=()):
+        self.sent = []
+        self.refused = set(refused)
+
+    def sendmail(self, sender, recipients, message):
+        if recipients[0] in self.refused:
+            raise smtplib.SMTPRecipientsRefused({recipients[0]: (550, b"No such user")})
+
+        self.sent.extend(recipients)
+
+
+class FakePool:
+    # Stands in for SMTPConnectionPool.connection()
+
+    def __init__(self, server=None, error=None):
+        self.server = server or FakeServer()
+        self.error = error
+
+    @contextmanager
+    def connection(self):
+        if self.error:
+            raise self.error
+
+        yield self.server, SETTINGS
+
+
+def enqueue(db, *recipients):
+    for recipient in recipients:
+        MailService.enqueue(db, recipient, "Leave approved", "Your leave was approved")
+
+    db.commit()
+
+
+def outbox(db):
+    db.expire_all()
+    return {m.recipient: m for m in db.query(MailOutbox).all()}
+
+
+def test_batch_sends_pending_messages(db):
+    enqueue(db, "a@example.com", "b@example.com")
+    pool = FakePool()
+
+    assert MailService.process_batch(db, pool) == 2
+    assert pool.server.sent == ["a@example.com", "b@example.com"]
+    assert {m.status for m in outbox(db).values()} == {"sent"}
+
+    # Sent messages are not claimed again
+    assert MailService.process_batch(db, pool) == 0
+
+
+def test_refused_recipient_is_retried_later(db):
+    enqueue(db, "a@example.com", "gone@example.com")
+    pool = FakePool(FakeServer(refused={"gone@example.com"}))
+
+    assert MailService.process_batch(db, pool) == 2
+
+    messages = outbox(db)
+    refused = messages["gone@example.com"]
+
+    assert messages["a@example.com"].status == "sent"
+    assert refused.status == "pending"
+    assert refused.attempts == 1
+    assert "No such user" in refused.last_error
+    assert refused.next_attempt_at > datetime.now(timezone.utc)
+
+    # Backed off, so the next batch does not pick it up
+    assert MailService.process_batch(db, pool) == 0
+
+
+def test_connection_failure_keeps_the_batch_for_retry(db):
+    enqueue(db, "a@example.com", "b@example.com")
+    pool = FakePool(error=OSError("connection refused"))
+
+    assert MailService.process_batch(db, pool) == 2
+
+    for message in outbox(db).values():
+        assert message.status == "pending"
+        assert message.attempts == 1
+        assert message.last_error == "connection refused"
+
+
+def test_workers_skip_rows_claimed_by_another_worker(db, session_factory):
+    enqueue(db, "a@example.com", "b@example.com", "c@example.com")
+
+    other_worker = session_factory()
+
+    try:
+        claimed = other_worker.query(MailOutbox).order_by(
+            MailOutbox.id
+        ).limit(2).with_for_update(skip_locked=True).all()
+
+        pool = FakePool()
+
+        # The first two rows stay locked by the other worker's transaction
+        assert MailService.process_batch(db, pool) == 1
+        assert pool.server.sent == ["c@example.com"]
+        assert [m.recipient for m in claimed] == ["a@example.com", "b@example.com"]
+    finally:
+        other_worker.rollback()
+        other_worker.close()